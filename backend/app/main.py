@@ -1,50 +1,97 @@
 """FastAPI application entry point"""
 
-from fastapi import FastAPI
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
+from db.database import engine
 from auth.routes import router as auth_router
 from photo.routes import router as photo_router
 
+logger = logging.getLogger(__name__)
+
+# Local storage directory for photo uploads
+uploads_dir = Path("uploads")
+
+# Static response bodies, encoded once at import instead of per request
+_HEALTH_BODY = b'{"status":"healthy","version":"0.1.0"}'
+_ROOT_BODY = b'{"message":"Welcome to PupMatch API"}'
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Create the uploads directory at startup instead of at import time, so
+    # importing the app (e.g. gunicorn --preload) does no disk I/O.
+    # mkdir(exist_ok=True) is a single syscall; no separate exists() check.
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    # Default executor for CPU-bound work offloaded from the event loop
+    # (password hashing in AuthService)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2))
+    )
+    # A sync or null pool here would serialize or stall every DB request
+    logger.info("Database pool: %s (%s)", type(engine.pool).__name__, engine.pool.status())
+    yield
+
+
 app = FastAPI(
     title="PupMatch API",
     description="Backend API for PupMatch - A puppy dating application",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
+# Starlette checks `origin in allow_origins` on every request; a frozenset
+# makes that a hash lookup instead of a list scan
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_origins=settings.allowed_origins_set,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(auth_router)
-app.include_router(photo_router)
-
-# Mount static files for photo uploads (local storage)
-# This serves files from the uploads/ directory at /uploads/* URLs
-# Example: uploads/photos/abc123.jpg → http://localhost:8000/uploads/photos/abc123.jpg
-# In production with S3/GCS, this won't be needed (cloud storage provides URLs directly)
-import os
-uploads_dir = "uploads"
-if not os.path.exists(uploads_dir):
-    os.makedirs(uploads_dir)
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
-
-
+# Starlette matches routes in registration order, so the health probe and
+# root are registered before the routers and match on the first comparison
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "version": "0.1.0"}
+    # Pre-encoded body: no dict allocation or JSON encoding on this hot path
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {"message": "Welcome to PupMatch API"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+# Include routers
+app.include_router(auth_router)
+app.include_router(photo_router)
+
+# Mount static files for photo uploads (local storage), in development only
+# This serves files from the uploads/ directory at /uploads/* URLs
+# Example: uploads/photos/abc123.jpg → http://localhost:8000/uploads/photos/abc123.jpg
+# In production /uploads/* is served by the reverse proxy / CDN, so image
+# bytes never pass through a Python worker (see README "Serving uploads")
+# check_dir=False: the directory is created by lifespan(), after this mount
+# html=False: no index.html lookups on directory paths
+if settings.DEBUG:
+    app.mount(
+        "/uploads",
+        StaticFiles(directory=uploads_dir, check_dir=False, html=False),
+        name="uploads",
+    )
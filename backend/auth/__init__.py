@@ -17,7 +17,13 @@ from auth.schemas import (
     PasswordResetRequest,
     PasswordResetConfirm,
 )
-from auth.dependencies import get_current_user, require_auth
+from auth.dependencies import (
+    get_current_user,
+    get_current_user_full,
+    get_current_user_id,
+    get_token_claims,
+    require_auth,
+)
 
 __all__ = [
     "AuthService",
@@ -28,5 +34,8 @@ __all__ = [
     "PasswordResetRequest",
     "PasswordResetConfirm",
     "get_current_user",
+    "get_current_user_full",
+    "get_current_user_id",
+    "get_token_claims",
     "require_auth",
 ]
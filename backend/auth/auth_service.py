@@ -1,13 +1,23 @@
 """Authentication service implementation"""
 
+import asyncio
+import hashlib
+import hmac
+import time
 import uuid
-from datetime import datetime, timedelta
 from typing import Optional
 
 import bcrypt
-from jose import JWTError, jwt
-from sqlalchemy import select
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+import jwt
+import orjson
+from redis.asyncio import Redis
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached, raiseload
 
 from app.config import settings
 from db.models.user import User
@@ -20,6 +30,159 @@ from auth.exceptions import (
 )
 
 
+# Argon2id hasher for new passwords (OWASP profile by default: 46 MiB, t=1, p=1)
+_password_hasher = PasswordHasher(
+    time_cost=settings.PASSWORD_HASH_TIME_COST,
+    memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+    parallelism=settings.PASSWORD_HASH_PARALLELISM,
+)
+
+# Prefix of legacy bcrypt hashes ($2a$, $2b$, $2y$)
+_BCRYPT_PREFIX = "$2"
+
+# Verified against when the email is unknown, so a missing user costs the
+# same KDF time as a wrong password and can't be told apart by timing
+_DUMMY_PASSWORD_HASH = _password_hasher.hash(uuid.uuid4().hex)
+
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT with orjson parsing the claims (PyJWT's _decode_payload hook)"""
+    
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}")
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+# JWT codecs: claims are (de)serialized with orjson instead of stdlib json.
+# Signing goes through PyJWS directly with pre-serialized claims, which
+# only ever hold JSON-native values (ints and strings).
+_jwt = _OrjsonJWT()
+_jws = jwt.PyJWS()
+
+# Key material prepared once at import instead of on every call
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode('utf-8')
+_JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+_ACCESS_TOKEN_LIFETIME_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_PASSWORD_CACHE_HMAC = hmac.new(_SECRET_KEY_BYTES, digestmod=hashlib.sha256)
+
+# Recently verified (password, hash) pairs, so repeat logins within the TTL
+# skip the password KDF (Argon2id, or bcrypt for legacy hashes). Keys are
+# HMACs under SECRET_KEY; plaintext passwords are never stored. Only
+# successful verifications are cached.
+_verified_passwords: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _password_cache_key(password: str, password_hash: str) -> bytes:
+    """HMAC-SHA256 of password and hash, used as the verification cache key"""
+    # copy() forks the precomputed keyed state instead of re-deriving it
+    mac = _PASSWORD_CACHE_HMAC.copy()
+    mac.update(password.encode('utf-8') + b"|" + password_hash.encode('utf-8'))
+    return mac.digest()
+
+
+# Users loaded by validate_token, keyed by id. Bounds how long a deleted
+# user or changed password can go unnoticed by token auth to the TTL.
+# Values are tuples of _USER_CACHE_COLUMNS, never ORM instances: those
+# belong to the session that loaded them (expired on its rollback,
+# dirty once a route edits them) and can't be shared across requests.
+_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+_USER_CACHE_COLUMNS = ("id", "email", "password_hash", "created_at", "updated_at")
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """Drop a user from the validate_token cache (call after password changes)"""
+    _user_cache.pop(user_id, None)
+
+
+# Verified token claims, keyed by the raw token string
+_decoded_tokens: TTLCache = TTLCache(
+    maxsize=10_000, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+# Redis key prefix marking a token's jti as revoked (expires with the token)
+REVOKED_TOKEN_PREFIX = "auth:revoked:"
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify a JWT access token and return its claims, without a database hit
+    
+    Args:
+        token: JWT access token
+        
+    Returns:
+        Token claims ("sub" is guaranteed to be a valid UUID string)
+        
+    Raises:
+        InvalidTokenError: If token is invalid or expired
+    """
+    # Clients resend the same token on every call; a hit skips the HMAC
+    # and base64/JSON decoding. Keys are full signed tokens, so only
+    # tokens that verified once can be cached. The TTL is the longest a
+    # token can live, so "exp" is still checked on every hit.
+    cached = _decoded_tokens.get(token)
+    if cached is not None:
+        exp = cached.get("exp")
+        if exp is not None and exp <= time.time():
+            raise InvalidTokenError("Token has expired")
+        return cached
+    
+    try:
+        payload = _jwt.decode(
+            token,
+            _SECRET_KEY_BYTES,
+            algorithms=_JWT_ALGORITHMS
+        )
+        subject: Optional[str] = payload.get("sub")
+        
+        if subject is None:
+            raise InvalidTokenError("Invalid token payload")
+        
+        uuid.UUID(subject)
+        
+    except jwt.ExpiredSignatureError:
+        # PyJWT checks "exp" while decoding
+        raise InvalidTokenError("Token has expired")
+    except (jwt.InvalidTokenError, ValueError) as e:
+        raise InvalidTokenError(f"Invalid token: {str(e)}")
+    
+    _decoded_tokens[token] = payload
+    return payload
+
+
+async def is_token_revoked(redis_client: Redis, claims: dict) -> bool:
+    """Check whether a token's jti has been revoked (one Redis EXISTS)"""
+    jti = claims.get("jti")
+    if jti is None:
+        return False
+    return bool(await redis_client.exists(f"{REVOKED_TOKEN_PREFIX}{jti}"))
+
+
+async def revoke_token(redis_client: Redis, claims: dict) -> None:
+    """Revoke a token until it would have expired anyway"""
+    jti = claims.get("jti")
+    ttl = int(claims.get("exp", 0) - time.time())
+    if jti is None or ttl <= 0:
+        return
+    await redis_client.set(f"{REVOKED_TOKEN_PREFIX}{jti}", 1, ex=ttl)
+
+
+def _check_password(password: str, password_hash: str) -> bool:
+    """Run the (CPU-bound) KDF check against an Argon2id or bcrypt hash"""
+    if password_hash.startswith(_BCRYPT_PREFIX):
+        return bcrypt.checkpw(
+            password.encode('utf-8'),
+            password_hash.encode('utf-8')
+        )
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
 class AuthService:
     """Service for handling user authentication"""
     
@@ -39,30 +202,35 @@ class AuthService:
         Raises:
             UserAlreadyExistsError: If email is already registered
         """
-        # Check if user already exists
+        # Hash password
+        password_hash = await self._hash_password(password)
+        
+        # Create new user in one atomic statement: the unique indexes decide
+        # existence, so there is no SELECT round-trip and no race between
+        # check and insert. No conflict target, so a clash on either the
+        # email constraint or the lower(email) index (case variants of an
+        # existing email) is skipped instead of raising IntegrityError.
+        # RETURNING hands back the server-side created_at from the INSERT.
         result = await self.db.execute(
-            select(User).where(User.email == email)
+            insert(User)
+            .values(email=email.lower(), password_hash=password_hash)
+            .on_conflict_do_nothing()
+            .returning(User.id, User.email, User.created_at)
         )
-        existing_user = result.scalar_one_or_none()
+        row = result.first()
         
-        if existing_user:
+        if row is None:
+            await self.db.rollback()
             raise UserAlreadyExistsError(f"User with email {email} already exists")
         
-        # Hash password
-        password_hash = self._hash_password(password)
-        
-        # Create new user
-        user = User(
-            id=str(uuid.uuid4()),
-            email=email,
-            password_hash=password_hash,
-        )
-        
-        self.db.add(user)
         await self.db.commit()
-        await self.db.refresh(user)
         
-        return UserResponse.model_validate(user)
+        # Trusted values straight from RETURNING; skip validation
+        return UserResponse.model_construct(
+            id=row.id,
+            email=row.email,
+            created_at=row.created_at,
+        )
     
     async def login(self, email: str, password: str) -> AuthToken:
         """Login user and return JWT token
@@ -77,21 +245,34 @@ class AuthService:
         Raises:
             InvalidCredentialsError: If email or password is incorrect
         """
-        # Find user by email
+        # Find user by email, fetching only the columns login needs as a
+        # plain row (no ORM object)
         result = await self.db.execute(
-            select(User).where(User.email == email)
+            select(User.id, User.email, User.password_hash, User.created_at)
+            .where(func.lower(User.email) == email.lower())
         )
-        user = result.scalar_one_or_none()
+        user = result.one_or_none()
         
-        if not user:
+        # Verify password; unknown emails still run the KDF (against the
+        # dummy hash) so both failures take the same time
+        password_hash = user.password_hash if user else _DUMMY_PASSWORD_HASH
+        verified = await self._verify_password(password, password_hash)
+        if user is None or not verified:
             raise InvalidCredentialsError("Invalid email or password")
         
-        # Verify password
-        if not self._verify_password(password, user.password_hash):
-            raise InvalidCredentialsError("Invalid email or password")
+        # Transparently upgrade legacy bcrypt hashes (or outdated Argon2
+        # parameters) now that we have the plain text password
+        if self._needs_rehash(user.password_hash):
+            await self.db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(password_hash=await self._hash_password(password))
+            )
+            await self.db.commit()
+            invalidate_cached_user(user.id)
         
         # Generate JWT token
-        token = self._create_access_token(user.id)
+        token = self._create_access_token(user)
         
         return AuthToken(
             access_token=token,
@@ -111,35 +292,45 @@ class AuthService:
             InvalidTokenError: If token is invalid or expired
             UserNotFoundError: If user no longer exists
         """
-        try:
-            # Decode JWT token
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
-            user_id: str = payload.get("sub")
+        claims = decode_access_token(token)
+        return await self.get_user(uuid.UUID(claims["sub"]))
+    
+    async def get_user(self, user_id: uuid.UUID) -> User:
+        """Get a user by ID, served from a short-lived cache when possible
+        
+        Args:
+            user_id: User ID (e.g. the "sub" claim of a validated token)
             
-            if user_id is None:
-                raise InvalidTokenError("Invalid token payload")
+        Returns:
+            User object attached to this service's session
             
-            # Check expiration
-            exp = payload.get("exp")
-            if exp and datetime.utcnow().timestamp() > exp:
-                raise InvalidTokenError("Token has expired")
-                
-        except JWTError as e:
-            raise InvalidTokenError(f"Invalid token: {str(e)}")
+        Raises:
+            UserNotFoundError: If user no longer exists
+        """
+        # The session's own copy wins, keeping any changes made to it
+        user = self.db.identity_map.get(self.db.identity_key(User, user_id))
+        if user is not None:
+            return user
         
-        # Get user from database
-        result = await self.db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        # Recently validated users skip the database: a fresh instance is
+        # built from the cached columns, made detached and clean by
+        # make_transient_to_detached, then attached without emitting SQL
+        cached_row = _user_cache.get(user_id)
+        if cached_row is not None:
+            user = User(**dict(zip(_USER_CACHE_COLUMNS, cached_row)))
+            make_transient_to_detached(user)
+            self.db.add(user)
+            return user
+        
+        # Get user from database (identity-map aware, by primary key).
+        # raiseload: callers get the row only; touching user.profile raises
+        # instead of silently issuing another query
+        user = await self.db.get(User, user_id, options=[raiseload("*")])
         
         if not user:
             raise UserNotFoundError(f"User {user_id} not found")
         
+        _user_cache[user_id] = tuple(getattr(user, c) for c in _USER_CACHE_COLUMNS)
         return user
     
     async def request_password_reset(self, email: str) -> None:
@@ -156,11 +347,10 @@ class AuthService:
             For now, it just validates the user exists.
         """
         result = await self.db.execute(
-            select(User).where(User.email == email)
+            select(1).where(func.lower(User.email) == email.lower()).limit(1)
         )
-        user = result.scalar_one_or_none()
         
-        if not user:
+        if result.scalar() is None:
             raise UserNotFoundError(f"User with email {email} not found")
         
         # TODO: Generate reset token and send email
@@ -183,24 +373,27 @@ class AuthService:
             storing reset tokens in Redis with expiration.
         """
         # TODO: Implement password reset token validation
-        # For now, this is a placeholder
+        # For now, this is a placeholder. Once implemented, call
+        # invalidate_cached_user(user.id) after updating password_hash.
         raise NotImplementedError("Password reset not yet implemented")
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt
+    async def _hash_password(self, password: str) -> str:
+        """Hash password using Argon2id, in the default thread pool
         
         Args:
             password: Plain text password
             
         Returns:
-            Hashed password string
+            Hashed password string (PHC format, "$argon2id$...")
         """
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _password_hasher.hash, password)
     
-    def _verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify password against hash
+    async def _verify_password(self, password: str, password_hash: str) -> bool:
+        """Verify password against an Argon2id or legacy bcrypt hash
+        
+        The KDF runs in the default thread pool so concurrent logins don't
+        block the event loop.
         
         Args:
             password: Plain text password
@@ -209,33 +402,58 @@ class AuthService:
         Returns:
             True if password matches, False otherwise
         """
-        return bcrypt.checkpw(
-            password.encode('utf-8'),
-            password_hash.encode('utf-8')
-        )
+        key = _password_cache_key(password, password_hash)
+        if key in _verified_passwords:
+            return True
+        
+        loop = asyncio.get_running_loop()
+        verified = await loop.run_in_executor(None, _check_password, password, password_hash)
+        if verified:
+            _verified_passwords[key] = True
+        return verified
+    
+    def _needs_rehash(self, password_hash: str) -> bool:
+        """Check whether a stored hash should be replaced on next login
+        
+        Args:
+            password_hash: Hashed password from database
+            
+        Returns:
+            True for bcrypt hashes and Argon2 hashes with outdated parameters
+        """
+        if password_hash.startswith(_BCRYPT_PREFIX):
+            return True
+        return _password_hasher.check_needs_rehash(password_hash)
     
-    def _create_access_token(self, user_id: str) -> str:
+    def _create_access_token(self, user: User) -> str:
         """Create JWT access token
         
+        Besides the user ID, the token carries the public user fields so
+        endpoints that only need them can skip the database (see
+        auth.dependencies.get_token_claims), and a unique jti for revocation.
+        
         Args:
-            user_id: User ID to encode in token
+            user: User (or row) with id, email and created_at
             
         Returns:
             JWT token string
         """
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        # Integer epoch seconds straight from time.time(): no datetime
+        # objects to build and convert back to timestamps
+        now = int(time.time())
         
         payload = {
-            "sub": user_id,
-            "exp": expire,
-            "iat": datetime.utcnow(),
+            "sub": str(user.id),
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+            "jti": uuid.uuid4().hex,
+            "exp": now + _ACCESS_TOKEN_LIFETIME_SECONDS,
+            "iat": now,
         }
         
-        token = jwt.encode(
-            payload,
-            settings.SECRET_KEY,
+        token = _jws.encode(
+            orjson.dumps(payload),
+            _SECRET_KEY_BYTES,
             algorithm=settings.JWT_ALGORITHM
         )
         
@@ -1,18 +1,22 @@
 """FastAPI dependencies for authentication"""
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import uuid
+
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.redis_client import get_redis
 from db.database import get_db
 from db.models.user import User
-from auth.auth_service import AuthService
+from auth.auth_service import AuthService, decode_access_token, is_token_revoked
 from auth.exceptions import InvalidTokenError, UserNotFoundError
 
 
-# HTTP Bearer token scheme
-# This tells FastAPI to look for "Authorization: Bearer <token>" header
-security = HTTPBearer()
+# Length of the "Bearer " prefix of the Authorization header
+_BEARER_PREFIX_LEN = len("Bearer ")
 
 
 async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
@@ -33,55 +37,98 @@ async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
     return AuthService(db)
 
 
-async def get_current_user(
-    # Step 1: Extract Bearer token from Authorization header
+async def get_token_claims(
+    # Raw Authorization header
     # Client sends: Authorization: Bearer eyJhbGci...
-    # FastAPI extracts and creates HTTPAuthorizationCredentials object with:
-    #   - scheme: "Bearer"
-    #   - credentials: "eyJhbGci..." (the actual JWT token)
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    authorization: Optional[str] = Header(None),
+    redis_client: Redis = Depends(get_redis),
+) -> dict:
+    """Get the verified claims of the request's JWT, without a database query
+    
+    Checks signature, expiration and revocation (one Redis lookup). Tokens
+    carry sub (user ID), email and created_at, so endpoints that only need
+    those should depend on this (or get_current_user_id) instead of
+    get_current_user.
+    
+    Args:
+        authorization: Authorization header ("Bearer <token>")
+        redis_client: Redis client holding revoked token IDs
+        
+    Returns:
+        Token claims
+        
+    Raises:
+        HTTPException 401: If the header is missing, or the token is
+            invalid, expired or revoked
+    """
+    try:
+        # Slice the header directly rather than going through HTTPBearer's
+        # scheme parsing; the scheme compare stays case-insensitive
+        if (
+            authorization is None
+            or authorization[:_BEARER_PREFIX_LEN].lower() != "bearer "
+        ):
+            raise InvalidTokenError("Not authenticated")
+        claims = decode_access_token(authorization[_BEARER_PREFIX_LEN:])
+        if await is_token_revoked(redis_client, claims):
+            raise InvalidTokenError("Token has been revoked")
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+async def get_current_user_id(
+    claims: dict = Depends(get_token_claims),
+) -> uuid.UUID:
+    """Get the authenticated user's ID from the JWT (no database query)
+    
+    Args:
+        claims: Verified token claims
+        
+    Returns:
+        Current user's ID
+    """
+    return uuid.UUID(claims["sub"])
+
+
+async def get_current_user(
+    # Step 1: Verify the Bearer token and get the user ID from its claims
+    user_id: uuid.UUID = Depends(get_current_user_id),
     
     # Step 2: Get AuthService instance (with database session)
     auth_service: AuthService = Depends(get_auth_service),
 ) -> User:
     """Get current authenticated user from JWT token
     
-    This dependency is used to protect endpoints that require authentication.
-    It extracts the JWT token from the Authorization header, validates it,
-    and returns the authenticated User object.
+    This dependency is used to protect endpoints that need the full User
+    row. Endpoints that only need the user ID should use
+    get_current_user_id, which skips the database.
     
     Flow:
     1. Extract token from "Authorization: Bearer <token>" header
-    2. Decode JWT and verify signature
-    3. Check token expiration
-    4. Get user from database
-    5. Return User object to endpoint
+    2. Decode JWT, verify signature, expiration and revocation
+    3. Get user from cache or database
+    4. Return User object to endpoint
     
     Args:
-        credentials: HTTP Bearer credentials (contains JWT token)
-        auth_service: Authentication service for token validation
+        user_id: ID of the authenticated user (from the token)
+        auth_service: Authentication service for the user lookup
         
     Returns:
         Current authenticated user
         
     Raises:
-        HTTPException 401: If token is invalid, expired, or user not found
+        HTTPException 401: If token is invalid, expired, revoked or user not found
     """
-    # Step 3: Extract the actual JWT token string
-    # credentials.credentials = "eyJhbGci..." (the JWT token)
-    # (Note: credentials.scheme = "Bearer")
-    token = credentials.credentials
-    
     try:
-        # Step 4: Validate token and get user
-        # This will:
-        # - Decode JWT and verify signature
-        # - Check expiration
-        # - Query database for user
-        user = await auth_service.validate_token(token)
-        return user
-    except (InvalidTokenError, UserNotFoundError) as e:
-        # Step 5: If validation fails, return 401 Unauthorized
+        # Step 3: Get user (short-lived cache, then database)
+        return await auth_service.get_user(user_id)
+    except UserNotFoundError as e:
+        # Step 4: If the user is gone, return 401 Unauthorized
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
@@ -89,6 +136,10 @@ async def get_current_user(
         )
 
 
+# Explicit name for the database-backed dependency
+get_current_user_full = get_current_user
+
+
 async def require_auth(
     current_user: User = Depends(get_current_user),
 ) -> User:
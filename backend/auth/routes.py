@@ -24,9 +24,14 @@ WHY KEEP AUTH AS REST?
 The AuthService is API-agnostic and can be called from REST, GraphQL, or anywhere!
 """
 
+import uuid
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
 
-from auth.auth_service import AuthService
+from app.redis_client import get_redis
+from auth.auth_service import AuthService, revoke_token
 from auth.schemas import (
     RegisterRequest,
     LoginRequest,
@@ -34,13 +39,12 @@ from auth.schemas import (
     UserResponse,
     PasswordResetRequest,
 )
-from auth.dependencies import get_auth_service, get_current_user
+from auth.dependencies import get_auth_service, get_token_claims
 from auth.exceptions import (
     InvalidCredentialsError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
-from db.models.user import User
 
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -112,17 +116,57 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    claims: dict = Depends(get_token_claims),
+    auth_service: AuthService = Depends(get_auth_service),
 ):
     """Get current authenticated user information
     
+    Served from the token claims; only tokens issued before the claims
+    were added fall back to the database.
+    
     Args:
-        current_user: Current authenticated user
+        claims: Verified token claims
+        auth_service: Authentication service
         
     Returns:
         UserResponse with user data
     """
-    return UserResponse.model_validate(current_user)
+    # Claims and DB rows are trusted, so skip validation with model_construct
+    if "email" in claims and "created_at" in claims:
+        return UserResponse.model_construct(
+            id=uuid.UUID(claims["sub"]),
+            email=claims["email"],
+            created_at=datetime.fromisoformat(claims["created_at"]),
+        )
+    
+    try:
+        current_user = await auth_service.get_user(uuid.UUID(claims["sub"]))
+    except UserNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return UserResponse.model_construct(
+        id=current_user.id,
+        email=current_user.email,
+        created_at=current_user.created_at,
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    claims: dict = Depends(get_token_claims),
+    redis_client: Redis = Depends(get_redis),
+):
+    """Revoke the current access token
+    
+    Args:
+        claims: Verified token claims
+        redis_client: Redis client holding revoked token IDs
+    """
+    await revoke_token(redis_client, claims)
+    return None
 
 
 @router.post("/password-reset/request", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,7 @@
 """Pydantic schemas for authentication"""
 
 from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -25,7 +26,7 @@ class AuthToken(BaseModel):
 
 class UserResponse(BaseModel):
     """User response (without sensitive data)"""
-    id: str
+    id: UUID
     email: str
     created_at: datetime
     
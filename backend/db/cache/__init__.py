@@ -0,0 +1,5 @@
+"""Redis-backed caches for derived database values"""
+
+from db.cache.unread import get_unread_count, invalidate_unread_counts
+
+__all__ = ["get_unread_count", "invalidate_unread_counts"]
@@ -0,0 +1,81 @@
+"""Per-user unread message count cache
+
+Counts are cached in Redis under `unread:<user_id>` and deleted whenever
+a message is inserted for, or read by, that user (see the Message event
+hooks in db/models/messaging.py). Bulk UPDATE/INSERT statements bypass
+those hooks and must call invalidate_unread_counts themselves.
+"""
+
+import asyncio
+import uuid
+from typing import Iterable
+
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from db.models.messaging import Message
+
+UNREAD_COUNT_PREFIX = "unread:"
+
+# Fire-and-forget invalidations still running (kept so they aren't GC'd)
+_pending_invalidations: set[asyncio.Task] = set()
+
+
+async def get_unread_count(db: AsyncSession, redis_client: Redis, user_id: uuid.UUID) -> int:
+    """Get how many unread messages a user has
+    
+    Args:
+        db: Database session, used on a cache miss
+        redis_client: Redis client
+        user_id: Recipient user ID
+        
+    Returns:
+        Number of messages with read_at IS NULL for the user
+    """
+    key = f"{UNREAD_COUNT_PREFIX}{user_id}"
+    cached = await redis_client.get(key)
+    if cached is not None:
+        return int(cached)
+    
+    # Served by the ix_messages_recipient_unread partial index
+    count = await db.scalar(
+        select(func.count())
+        .select_from(Message)
+        .where(Message.recipient_id == user_id, Message.read_at.is_(None))
+    )
+    await redis_client.set(key, count, ex=settings.CACHE_TTL_UNREAD_COUNT)
+    return count
+
+
+async def invalidate_unread_counts(redis_client: Redis, user_ids: Iterable[uuid.UUID]) -> None:
+    """Drop cached unread counts so the next read recounts
+    
+    Args:
+        redis_client: Redis client
+        user_ids: Recipient user IDs whose counts changed
+    """
+    keys = [f"{UNREAD_COUNT_PREFIX}{user_id}" for user_id in user_ids]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+def schedule_unread_count_invalidation(user_ids: Iterable[uuid.UUID]) -> None:
+    """Invalidate cached counts in the background, from synchronous ORM hooks
+    
+    Outside a running event loop (sync scripts) this is a no-op; the
+    cache TTL bounds how stale a count can get.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    
+    from app.redis_client import redis_pool
+    
+    task = loop.create_task(
+        invalidate_unread_counts(Redis(connection_pool=redis_pool), list(user_ids))
+    )
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
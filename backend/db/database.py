@@ -1,17 +1,13 @@
 """Database connection and session management"""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
-from app.config import settings
+from db.engine import get_engine
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    echo=settings.DEBUG,
-)
+# Create async engine (shared process-wide, see db.engine.get_engine)
+engine = get_engine()
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -20,8 +16,40 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+
+class ReprMixin:
+    """Model __repr__ built from the attribute names in __repr_fields__
+    
+    The format template is compiled once per class, so each call is a
+    single str.format over the current attribute values.
+    """
+    
+    __repr_fields__: tuple[str, ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = ", ".join(f"{name}={{}}" for name in cls.__repr_fields__)
+        cls._repr_template = f"<{cls.__name__}({fields})>"
+    
+    def __repr__(self) -> str:
+        if not self.__repr_fields__:
+            return object.__repr__(self)
+        return self._repr_template.format(
+            *[getattr(self, name) for name in self.__repr_fields__]
+        )
+
+
 # Base class for models
-Base = declarative_base()
+Base = declarative_base(cls=ReprMixin)
+
+
+def utc_now():
+    """SQL expression for the current UTC time as a naive timestamp
+    
+    All timestamp columns are `timestamp without time zone` holding UTC,
+    so no time zone conversion happens on read or write.
+    """
+    return func.timezone("utc", func.now())
 
 
 async def get_db() -> AsyncSession:
@@ -0,0 +1,56 @@
+"""Async engine factory shared by the app and the database scripts"""
+
+import functools
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+
+
+def create_db_engine(url: Optional[str] = None, **kwargs: Any) -> AsyncEngine:
+    """Create an async engine with the tuned pool and connection settings
+    
+    Args:
+        url: Database URL (defaults to settings.DATABASE_URL)
+        **kwargs: Extra create_async_engine arguments (e.g. isolation_level)
+        
+    Returns:
+        AsyncEngine backed by an AsyncAdaptedQueuePool
+    """
+    options: dict[str, Any] = {
+        # Explicit so a sync QueuePool or NullPool can never be swapped in:
+        # either would block the event loop or reconnect on every request
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        # Retire idle connections before servers/proxies drop them
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "echo": settings.DEBUG,
+        "connect_args": {
+            # Cache prepared statements per connection so hot queries
+            # (likes, mutual-match lookups) skip parse/plan on every execution
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                # Short OLTP queries pay JIT compilation cost without benefiting
+                "jit": "off",
+                # Identifies our sessions in pg_stat_activity / slow query logs
+                "application_name": settings.APP_NAME,
+            },
+        },
+    }
+    options.update(kwargs)
+    return create_async_engine(url or settings.DATABASE_URL, **options)
+
+
+@functools.cache
+def get_engine() -> AsyncEngine:
+    """Process-wide engine for settings.DATABASE_URL, created on first use
+    
+    Everything in the process (app sessions, scripts, tests) shares one
+    warm connection pool instead of building and disposing its own.
+    """
+    return create_db_engine()
@@ -5,11 +5,17 @@ Revises:
 Create Date: 2024-12-26 14:30:00.000000
 
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence, Union
+import asyncio
 
 from alembic import op
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
 import sqlalchemy as sa
+from sqlalchemy import pool
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
 import geoalchemy2
 
 # revision identifiers, used by Alembic.
@@ -18,6 +24,103 @@ down_revision: Union[str, None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Memory budget for building the spatial indexes (bulk sort in memory)
+INDEX_BUILD_MAINTENANCE_WORK_MEM = '1GB'
+
+# Connections used to build the secondary indexes in parallel. A single
+# backend builds one index at a time; separate sessions use separate cores
+INDEX_BUILD_WORKERS = 4
+
+# Secondary (non-constraint) indexes, as (name, table, columns, options)
+SECONDARY_INDEXES = [
+    ('ix_users_email', 'users', ['email'], {}),
+    ('ix_profiles_user_id', 'profiles', ['user_id'], {}),
+    ('ix_photos_profile_id', 'photos', ['profile_id'], {}),
+    ('ix_prompts_profile_id', 'prompts', ['profile_id'], {}),
+    ('ix_user_preferences_profile_id', 'user_preferences', ['profile_id'], {}),
+    ('ix_likes_target_id', 'likes', ['target_id'], {}),
+    ('ix_likes_target_user', 'likes', ['target_id', 'user_id'], {}),
+    ('ix_passes_target_id', 'passes', ['target_id'], {}),
+    ('ix_matches_created_at', 'matches', ['created_at'], {'postgresql_using': 'brin', 'postgresql_with': {'pages_per_range': 32}}),
+    ('ix_matches_user1_created', 'matches', ['user1_id', 'created_at'], {'postgresql_include': ['id', 'user2_id']}),
+    ('ix_matches_user2_created', 'matches', ['user2_id', 'created_at'], {'postgresql_include': ['id', 'user1_id']}),
+    ('ix_conversations_match_id', 'conversations', ['match_id'], {}),
+    ('ix_conversations_updated_at', 'conversations', ['updated_at'], {}),
+    ('ix_conversations_user1_updated', 'conversations', ['user1_id', 'updated_at'], {}),
+    ('ix_conversations_user2_updated', 'conversations', ['user2_id', 'updated_at'], {}),
+    ('ix_messages_sender_id', 'messages', ['sender_id'], {}),
+    ('ix_messages_created_at', 'messages', ['created_at'], {'postgresql_using': 'brin', 'postgresql_with': {'pages_per_range': 32}}),
+    ('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'], {}),
+    ('ix_messages_recipient_unread', 'messages', ['recipient_id'], {'postgresql_where': sa.text('read = false')}),
+    ('ix_playgrounds_user_id', 'playgrounds', ['user_id'], {}),
+]
+
+# Number of hash partitions for messages. Indexes declared on the parent
+# are created on every partition, so each B-tree stays 1/16th the size
+MESSAGE_PARTITIONS = 16
+
+
+def _create_location_index(index_name: str, table_name: str) -> None:
+    """Create the spatial index on a POINT location column
+
+    SP-GiST (quad-tree) indexes are smaller and faster than GiST for
+    point-only data, but need PostgreSQL >= 11 and PostGIS >= 2.5.
+    Older servers fall back to GiST.
+    """
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF current_setting('server_version_num')::int >= 110000
+               AND (
+                   SELECT (split_part(extversion, '.', 1)::int,
+                           split_part(extversion, '.', 2)::int) >= (2, 5)
+                   FROM pg_extension WHERE extname = 'postgis'
+               ) THEN
+                CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} USING SPGIST (location);
+            ELSE
+                CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} USING GIST (location);
+            END IF;
+        END
+        $$;
+    """)
+
+
+def _create_indexes(operations: Operations, indexes: list) -> None:
+    """Run CREATE INDEX for each (name, table, columns, options) entry"""
+    for name, table_name, columns, options in indexes:
+        operations.create_index(name, table_name, columns, unique=False, **options)
+
+
+def _create_indexes_on_new_connection(url: str, indexes: list) -> None:
+    """Open a dedicated autocommit connection and build the given indexes on it
+
+    Runs in a worker thread, so it drives its own event loop.
+    """
+    async def build() -> None:
+        engine = create_async_engine(url, poolclass=pool.NullPool)
+        try:
+            async with engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                await connection.exec_driver_sql(
+                    f"SET maintenance_work_mem = '{INDEX_BUILD_MAINTENANCE_WORK_MEM}'"
+                )
+                await connection.run_sync(
+                    lambda sync_connection: _create_indexes(
+                        Operations(MigrationContext.configure(sync_connection)), indexes
+                    )
+                )
+        finally:
+            await engine.dispose()
+
+    asyncio.run(build())
+
+
+def _raise_worker_failure(futures: list) -> None:
+    """Re-raise the first error among the index builds that have finished"""
+    for future in futures:
+        if future.done():
+            future.result()
+
 
 def upgrade() -> None:
     # Enable PostGIS extension
@@ -28,66 +131,60 @@ def upgrade() -> None:
     # Create users table
     op.create_table(
         'users',
-        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('email', sa.String(length=255), nullable=False),
         sa.Column('password_hash', sa.String(length=255), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('email')
     )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
     
     # Create profiles table
     op.create_table(
         'profiles',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(length=100), nullable=False),
         sa.Column('age', sa.Integer(), nullable=False),
         sa.Column('bio', sa.Text(), nullable=False),
         sa.Column('location', geoalchemy2.types.Geometry(geometry_type='POINT', srid=4326, from_text='ST_GeomFromEWKT', name='geometry'), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('user_id')
     )
-    op.create_index(op.f('ix_profiles_user_id'), 'profiles', ['user_id'], unique=False)
-    # Create spatial index on location (IF NOT EXISTS to avoid conflicts with GeoAlchemy2)
-    op.execute('CREATE INDEX IF NOT EXISTS idx_profiles_location ON profiles USING GIST (location)')
     
     # Create photos table
     op.create_table(
         'photos',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('profile_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('profile_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('url', sa.String(length=500), nullable=False),
         sa.Column('order', sa.Integer(), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_photos_profile_id'), 'photos', ['profile_id'], unique=False)
     
     # Create prompts table
     op.create_table(
         'prompts',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('profile_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('profile_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('question', sa.String(length=500), nullable=False),
         sa.Column('answer', sa.Text(), nullable=False),
         sa.Column('order', sa.Integer(), nullable=False),
         sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_prompts_profile_id'), 'prompts', ['profile_id'], unique=False)
     
     # Create user_preferences table
     op.create_table(
         'user_preferences',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('profile_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('profile_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('min_age', sa.Integer(), nullable=False, server_default='0'),
         sa.Column('max_age', sa.Integer(), nullable=False, server_default='20'),
         sa.Column('max_distance', sa.Float(), nullable=False, server_default='25.0'),
@@ -97,116 +194,142 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('profile_id')
     )
-    op.create_index(op.f('ix_user_preferences_profile_id'), 'user_preferences', ['profile_id'], unique=False)
     
     # Create likes table
     op.create_table(
         'likes',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('user_id', sa.String(length=36), nullable=False),
-        sa.Column('target_id', sa.String(length=36), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['target_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('user_id', 'target_id', name='uq_like_user_target')
+        # One row per (user, target); also serves lookups by user_id
+        sa.PrimaryKeyConstraint('user_id', 'target_id')
     )
-    op.create_index(op.f('ix_likes_user_id'), 'likes', ['user_id'], unique=False)
-    op.create_index(op.f('ix_likes_target_id'), 'likes', ['target_id'], unique=False)
-    op.create_index('ix_likes_target_user', 'likes', ['target_id', 'user_id'], unique=False)
     
     # Create passes table
     op.create_table(
         'passes',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('user_id', sa.String(length=36), nullable=False),
-        sa.Column('target_id', sa.String(length=36), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['target_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('user_id', 'target_id', name='uq_pass_user_target')
+        # One row per (user, target); also serves lookups by user_id
+        sa.PrimaryKeyConstraint('user_id', 'target_id')
     )
-    op.create_index(op.f('ix_passes_user_id'), 'passes', ['user_id'], unique=False)
-    op.create_index(op.f('ix_passes_target_id'), 'passes', ['target_id'], unique=False)
     
     # Create matches table
     op.create_table(
         'matches',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('user1_id', sa.String(length=36), nullable=False),
-        sa.Column('user2_id', sa.String(length=36), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user1_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user2_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['user1_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user2_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('user1_id < user2_id', name='ck_match_ordered'),
         sa.UniqueConstraint('user1_id', 'user2_id', name='uq_match_users')
     )
-    op.create_index(op.f('ix_matches_user1_id'), 'matches', ['user1_id'], unique=False)
-    op.create_index(op.f('ix_matches_user2_id'), 'matches', ['user2_id'], unique=False)
-    op.create_index(op.f('ix_matches_created_at'), 'matches', ['created_at'], unique=False)
-    op.create_index('ix_matches_user1_created', 'matches', ['user1_id', 'created_at'], unique=False)
-    op.create_index('ix_matches_user2_created', 'matches', ['user2_id', 'created_at'], unique=False)
     
     # Create conversations table
     op.create_table(
         'conversations',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('match_id', sa.String(length=36), nullable=False),
-        sa.Column('user1_id', sa.String(length=36), nullable=False),
-        sa.Column('user2_id', sa.String(length=36), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('match_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user1_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user2_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user1_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['user2_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('match_id')
     )
-    op.create_index(op.f('ix_conversations_match_id'), 'conversations', ['match_id'], unique=False)
-    op.create_index(op.f('ix_conversations_user1_id'), 'conversations', ['user1_id'], unique=False)
-    op.create_index(op.f('ix_conversations_user2_id'), 'conversations', ['user2_id'], unique=False)
-    op.create_index(op.f('ix_conversations_updated_at'), 'conversations', ['updated_at'], unique=False)
-    op.create_index('ix_conversations_user1_updated', 'conversations', ['user1_id', 'updated_at'], unique=False)
-    op.create_index('ix_conversations_user2_updated', 'conversations', ['user2_id', 'updated_at'], unique=False)
     
     # Create messages table
     op.create_table(
         'messages',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('conversation_id', sa.String(length=36), nullable=False),
-        sa.Column('sender_id', sa.String(length=36), nullable=False),
-        sa.Column('recipient_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('conversation_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sender_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('recipient_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('content', sa.Text(), nullable=False),
         sa.Column('read', sa.Boolean(), nullable=False, server_default='false'),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ondelete='CASCADE'),
         sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        # The partition key must be part of every unique constraint
+        sa.PrimaryKeyConstraint('id', 'conversation_id'),
+        postgresql_partition_by='HASH (conversation_id)'
     )
-    op.create_index(op.f('ix_messages_conversation_id'), 'messages', ['conversation_id'], unique=False)
-    op.create_index(op.f('ix_messages_sender_id'), 'messages', ['sender_id'], unique=False)
-    op.create_index(op.f('ix_messages_recipient_id'), 'messages', ['recipient_id'], unique=False)
-    op.create_index(op.f('ix_messages_created_at'), 'messages', ['created_at'], unique=False)
-    op.create_index('ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'], unique=False)
-    op.create_index('ix_messages_recipient_read', 'messages', ['recipient_id', 'read'], unique=False)
+    for remainder in range(MESSAGE_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE messages_p{remainder} PARTITION OF messages "
+            f"FOR VALUES WITH (MODULUS {MESSAGE_PARTITIONS}, REMAINDER {remainder})"
+        )
     
     # Create playgrounds table
     op.create_table(
         'playgrounds',
-        sa.Column('id', sa.String(length=36), nullable=False),
-        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(length=200), nullable=False),
         sa.Column('description', sa.Text(), nullable=False),
         sa.Column('location', geoalchemy2.types.Geometry(geometry_type='POINT', srid=4326, from_text='ST_GeomFromEWKT', name='geometry'), nullable=False),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=False), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_playgrounds_user_id'), 'playgrounds', ['user_id'], unique=False)
-    # Create spatial index on location (IF NOT EXISTS to avoid conflicts with GeoAlchemy2)
-    op.execute('CREATE INDEX IF NOT EXISTS idx_playgrounds_location ON playgrounds USING GIST (location)')
+    
+    # Build secondary indexes outside the DDL transaction. autocommit_block()
+    # commits the tables above first; each index then runs and commits on
+    # its own, so no table holds its lock until the end of the migration
+    with op.get_context().autocommit_block():
+        op.execute(f"SET maintenance_work_mem = '{INDEX_BUILD_MAINTENANCE_WORK_MEM}'")
+        
+        executor = None
+        futures = []
+        if op.get_context().as_sql:
+            # Offline SQL generation: emit the statements serially
+            _create_indexes(op, SECONDARY_INDEXES)
+        else:
+            # Fan the B-tree/BRIN indexes out over extra connections (the
+            # tables are committed, so other sessions can see them) while
+            # this connection builds the spatial indexes
+            url = op.get_bind().engine.url.render_as_string(hide_password=False)
+            batches = [SECONDARY_INDEXES[i::INDEX_BUILD_WORKERS] for i in range(INDEX_BUILD_WORKERS)]
+            executor = ThreadPoolExecutor(max_workers=INDEX_BUILD_WORKERS)
+            futures = [
+                executor.submit(_create_indexes_on_new_connection, url, batch)
+                for batch in batches if batch
+            ]
+        
+        try:
+            # Create spatial indexes on location last, after every table exists, so
+            # any seed/backfill run alongside this migration builds each tree in one
+            # bulk pass instead of paying page splits on every INSERT.
+            # (IF NOT EXISTS to avoid conflicts with GeoAlchemy2)
+            _create_location_index('idx_profiles_location', 'profiles')
+            # Stop before the next build if a worker has already failed
+            _raise_worker_failure(futures)
+            _create_location_index('idx_playgrounds_location', 'playgrounds')
+            op.execute('RESET maintenance_work_mem')
+        except BaseException:
+            # Never fail with workers still building indexes against a
+            # half-migrated schema: drop batches not yet started and wait
+            # out the running ones
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        
+        # Wait for every worker, then re-raise the first failure
+        if executor is not None:
+            executor.shutdown(wait=True)
+        _raise_worker_failure(futures)
 
 
 def downgrade() -> None:
@@ -215,36 +338,28 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_playgrounds_user_id'), table_name='playgrounds')
     op.drop_table('playgrounds')
     
-    op.drop_index('ix_messages_recipient_read', table_name='messages')
+    op.drop_index('ix_messages_recipient_unread', table_name='messages')
     op.drop_index('ix_messages_conversation_created', table_name='messages')
-    op.drop_index(op.f('ix_messages_created_at'), table_name='messages')
-    op.drop_index(op.f('ix_messages_recipient_id'), table_name='messages')
+    op.drop_index('ix_messages_created_at', table_name='messages')
     op.drop_index(op.f('ix_messages_sender_id'), table_name='messages')
-    op.drop_index(op.f('ix_messages_conversation_id'), table_name='messages')
     op.drop_table('messages')
     
     op.drop_index('ix_conversations_user2_updated', table_name='conversations')
     op.drop_index('ix_conversations_user1_updated', table_name='conversations')
     op.drop_index(op.f('ix_conversations_updated_at'), table_name='conversations')
-    op.drop_index(op.f('ix_conversations_user2_id'), table_name='conversations')
-    op.drop_index(op.f('ix_conversations_user1_id'), table_name='conversations')
     op.drop_index(op.f('ix_conversations_match_id'), table_name='conversations')
     op.drop_table('conversations')
     
     op.drop_index('ix_matches_user2_created', table_name='matches')
     op.drop_index('ix_matches_user1_created', table_name='matches')
-    op.drop_index(op.f('ix_matches_created_at'), table_name='matches')
-    op.drop_index(op.f('ix_matches_user2_id'), table_name='matches')
-    op.drop_index(op.f('ix_matches_user1_id'), table_name='matches')
+    op.drop_index('ix_matches_created_at', table_name='matches')
     op.drop_table('matches')
     
     op.drop_index(op.f('ix_passes_target_id'), table_name='passes')
-    op.drop_index(op.f('ix_passes_user_id'), table_name='passes')
     op.drop_table('passes')
     
     op.drop_index('ix_likes_target_user', table_name='likes')
     op.drop_index(op.f('ix_likes_target_id'), table_name='likes')
-    op.drop_index(op.f('ix_likes_user_id'), table_name='likes')
     op.drop_table('likes')
     
     op.drop_index(op.f('ix_user_preferences_profile_id'), table_name='user_preferences')
@@ -0,0 +1,97 @@
+"""Rebuild location indexes as SP-GiST
+
+Databases created before 001 switched to SP-GiST still carry GiST
+indexes on profiles.location and playgrounds.location. This revision
+rebuilds them with CREATE INDEX CONCURRENTLY so the tables stay
+writable while the new index is built. Servers without SP-GiST point
+support (PostgreSQL < 11 or PostGIS < 2.5) keep their GiST indexes.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-12-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LOCATION_INDEXES = [
+    ('idx_profiles_location', 'profiles'),
+    ('idx_playgrounds_location', 'playgrounds'),
+]
+
+
+def _index_method(index_name: str) -> Union[str, None]:
+    """Return the access method (gist, spgist, ...) of an existing index"""
+    return op.get_bind().execute(
+        sa.text("""
+            SELECT am.amname
+            FROM pg_class c
+            JOIN pg_am am ON am.oid = c.relam
+            WHERE c.relkind = 'i' AND c.relname = :name
+        """),
+        {"name": index_name},
+    ).scalar()
+
+
+def _spgist_supported() -> bool:
+    """Whether the server can build SP-GiST point indexes
+
+    Same gate as 001's _create_location_index: PostgreSQL >= 11 and
+    PostGIS >= 2.5. Older servers keep the GiST indexes 001 created.
+    """
+    return bool(op.get_bind().execute(
+        sa.text("""
+            SELECT current_setting('server_version_num')::int >= 110000
+               AND COALESCE((
+                   SELECT (split_part(extversion, '.', 1)::int,
+                           split_part(extversion, '.', 2)::int) >= (2, 5)
+                   FROM pg_extension WHERE extname = 'postgis'
+               ), false)
+        """)
+    ).scalar())
+
+
+def _rebuild_location_index(index_name: str, table_name: str, method: str) -> None:
+    """Swap a location index for one using another access method, without blocking writes"""
+    if _index_method(index_name) == method.lower():
+        return
+
+    new_name = f'{index_name}_new'
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {new_name}')
+        op.execute(
+            f'CREATE INDEX CONCURRENTLY {new_name} ON {table_name} USING {method} (location)'
+        )
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+        op.execute(f'ALTER INDEX {new_name} RENAME TO {index_name}')
+
+
+def upgrade() -> None:
+    # Nothing to rebuild when generating SQL offline; 001 already picks
+    # SP-GiST where the server supports it
+    if op.get_context().as_sql:
+        return
+
+    if not _spgist_supported():
+        return
+
+    for index_name, table_name in LOCATION_INDEXES:
+        _rebuild_location_index(index_name, table_name, 'SPGIST')
+
+
+def downgrade() -> None:
+    if op.get_context().as_sql:
+        return
+
+    for index_name, table_name in LOCATION_INDEXES:
+        _rebuild_location_index(index_name, table_name, 'GIST')
@@ -0,0 +1,80 @@
+"""Indexes for the auth lookups
+
+Adds a lower(email) expression index so logins can match emails
+case-insensitively without a sequential scan, and rebuilds
+ix_profiles_user_id as a covering index (INCLUDE name, age) so profile
+card lookups by user are index-only. profiles.user_id stays indexed
+throughout by its unique constraint. Both indexes are built
+CONCURRENTLY so the tables stay writable.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-12-28 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Drop first: a failed earlier run leaves an INVALID index behind
+        op.drop_index(
+            'ix_users_email_lower',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_users_email_lower',
+            'users',
+            [sa.text('lower(email)')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_profiles_user_id',
+            table_name='profiles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_profiles_user_id',
+            'profiles',
+            ['user_id'],
+            unique=False,
+            postgresql_include=['name', 'age'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_profiles_user_id',
+            table_name='profiles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_profiles_user_id',
+            'profiles',
+            ['user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_users_email_lower',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
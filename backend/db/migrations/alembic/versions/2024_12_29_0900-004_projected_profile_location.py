@@ -0,0 +1,97 @@
+"""Projected copy of profiles.location for distance queries
+
+Adds profiles.location_projected, the same point in Web Mercator
+(EPSG:3857), kept in sync with location by a BEFORE INSERT/UPDATE
+trigger. Distance filters run ST_DWithin on this column as planar math
+instead of spherical calculations on SRID 4326, served by an SP-GiST
+index built CONCURRENTLY.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-12-29 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PROJECTED_SRID = 3857
+
+# Longest ALTER TABLE / CREATE TRIGGER may queue for the table lock before
+# the migration fails, so it never stalls writers queued behind it
+LOCK_TIMEOUT = '5s'
+
+
+def upgrade() -> None:
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.add_column(
+        'profiles',
+        sa.Column(
+            'location_projected',
+            geoalchemy2.types.Geometry(geometry_type='POINT', srid=PROJECTED_SRID, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'),
+            nullable=True,
+        ),
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION profiles_project_location() RETURNS trigger AS $$
+        BEGIN
+            NEW.location_projected := ST_Transform(NEW.location, {PROJECTED_SRID});
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER profiles_project_location
+        BEFORE INSERT OR UPDATE OF location ON profiles
+        FOR EACH ROW EXECUTE FUNCTION profiles_project_location();
+    """)
+    # Backfill existing rows
+    op.execute(f"""
+        UPDATE profiles
+        SET location_projected = ST_Transform(location, {PROJECTED_SRID})
+        WHERE location IS NOT NULL
+    """)
+
+    op.execute('RESET lock_timeout')
+
+    with op.get_context().autocommit_block():
+        # Drop first: a failed earlier run leaves an INVALID index behind
+        op.drop_index(
+            'idx_profiles_location_projected',
+            table_name='profiles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'idx_profiles_location_projected',
+            'profiles',
+            ['location_projected'],
+            unique=False,
+            postgresql_using='spgist',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_profiles_location_projected',
+            table_name='profiles',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute('DROP TRIGGER IF EXISTS profiles_project_location ON profiles')
+    op.execute('DROP FUNCTION IF EXISTS profiles_project_location()')
+    op.drop_column('profiles', 'location_projected')
+    op.execute('RESET lock_timeout')
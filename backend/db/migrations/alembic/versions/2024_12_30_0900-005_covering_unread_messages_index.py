@@ -0,0 +1,71 @@
+"""Covering partial index for unread messages
+
+Rebuilds ix_messages_recipient_unread as (recipient_id, created_at)
+INCLUDE (id, sender_id) WHERE read = false, so the unread list (ordered
+by created_at) and unread count are index-only scans.
+
+messages is partitioned, and CREATE INDEX CONCURRENTLY is not allowed on
+a partitioned table. The new index is therefore created ON ONLY the
+parent (invalid until complete), built CONCURRENTLY on each partition
+and attached; once every partition is attached it becomes valid and
+replaces the old index under the same name.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-12-30 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match MESSAGE_PARTITIONS in 001_initial_schema
+MESSAGE_PARTITIONS = 16
+
+INDEX_NAME = 'ix_messages_recipient_unread'
+
+# Longest a statement may queue for a lock before the migration fails,
+# so it never stalls writers behind it. Concurrent builds run with no
+# timeout: they wait out open transactions without blocking anyone.
+LOCK_TIMEOUT = '5s'
+
+
+def _rebuild_unread_index(definition: str) -> None:
+    """Swap ix_messages_recipient_unread for a new definition, partition by partition"""
+    new_name = f'{INDEX_NAME}_new'
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute(f'DROP INDEX IF EXISTS {new_name}')
+    op.execute(f'CREATE INDEX {new_name} ON ONLY messages {definition}')
+    with op.get_context().autocommit_block():
+        for remainder in range(MESSAGE_PARTITIONS):
+            partition_index = f'messages_p{remainder}_recipient_unread_new'
+            op.execute('SET lock_timeout = 0')
+            # Drop first: a failed earlier run leaves an INVALID index behind
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {partition_index}')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY {partition_index} '
+                f'ON messages_p{remainder} {definition}'
+            )
+            op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+            op.execute(f'ALTER INDEX {new_name} ATTACH PARTITION {partition_index}')
+    op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    op.execute(f'ALTER INDEX {new_name} RENAME TO {INDEX_NAME}')
+    op.execute('RESET lock_timeout')
+
+
+def upgrade() -> None:
+    _rebuild_unread_index(
+        '(recipient_id, created_at) INCLUDE (id, sender_id) WHERE read = false'
+    )
+
+
+def downgrade() -> None:
+    _rebuild_unread_index('(recipient_id) WHERE read = false')
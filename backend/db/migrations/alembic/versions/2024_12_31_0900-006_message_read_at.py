@@ -0,0 +1,91 @@
+"""Replace messages.read with a nullable read_at timestamp
+
+read_at records when the recipient read the message and is NULL while
+unread. The unread partial index now filters on read_at IS NULL. It is
+built per partition (CONCURRENTLY, then attached to a parent index
+created ON ONLY messages) before the read column, and with it the old
+index, is dropped.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-12-31 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must match MESSAGE_PARTITIONS in 001_initial_schema
+MESSAGE_PARTITIONS = 16
+
+INDEX_NAME = 'ix_messages_recipient_unread'
+
+# Longest a statement may queue for a lock before the migration fails,
+# so it never stalls writers behind it. Concurrent builds run with no
+# timeout: they wait out open transactions without blocking anyone.
+LOCK_TIMEOUT = '5s'
+
+
+def _build_unread_index(definition: str) -> str:
+    """Build the unread index under a temporary name, partition by partition
+    
+    Returns:
+        The temporary index name, to be renamed once the old index is gone
+    """
+    new_name = f'{INDEX_NAME}_new'
+    op.execute(f'DROP INDEX IF EXISTS {new_name}')
+    op.execute(f'CREATE INDEX {new_name} ON ONLY messages {definition}')
+    with op.get_context().autocommit_block():
+        for remainder in range(MESSAGE_PARTITIONS):
+            partition_index = f'messages_p{remainder}_recipient_unread_new'
+            op.execute('SET lock_timeout = 0')
+            # Drop first: a failed earlier run leaves an INVALID index behind
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {partition_index}')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY {partition_index} '
+                f'ON messages_p{remainder} {definition}'
+            )
+            op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+            op.execute(f'ALTER INDEX {new_name} ATTACH PARTITION {partition_index}')
+    return new_name
+
+
+def upgrade() -> None:
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.add_column('messages', sa.Column('read_at', sa.DateTime(timezone=False), nullable=True))
+    # Exact read times were never recorded; created_at is the best lower bound
+    op.execute('UPDATE messages SET read_at = created_at WHERE read')
+
+    new_name = _build_unread_index(
+        '(recipient_id, created_at) INCLUDE (id, sender_id) WHERE read_at IS NULL'
+    )
+    op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    op.drop_column('messages', 'read')
+    op.execute(f'ALTER INDEX {new_name} RENAME TO {INDEX_NAME}')
+    op.execute('RESET lock_timeout')
+
+
+def downgrade() -> None:
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    op.add_column(
+        'messages',
+        sa.Column('read', sa.Boolean(), nullable=False, server_default='false'),
+    )
+    op.execute('UPDATE messages SET read = true WHERE read_at IS NOT NULL')
+
+    new_name = _build_unread_index(
+        '(recipient_id, created_at) INCLUDE (id, sender_id) WHERE read = false'
+    )
+    op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    op.drop_column('messages', 'read_at')
+    op.execute(f'ALTER INDEX {new_name} RENAME TO {INDEX_NAME}')
+    op.execute('RESET lock_timeout')
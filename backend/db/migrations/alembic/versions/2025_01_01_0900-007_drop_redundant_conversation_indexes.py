@@ -0,0 +1,59 @@
+"""Drop single-column conversation participant indexes
+
+Databases created before 001 stopped emitting them still carry
+ix_conversations_user1_id and ix_conversations_user2_id. Both are
+prefixes of ix_conversations_user1_updated / ix_conversations_user2_updated,
+which serve the same lookups, so they only cost writes. Dropped
+CONCURRENTLY so conversations stays writable.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-01-01 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REDUNDANT_INDEXES = [
+    ('ix_conversations_user1_id', 'user1_id'),
+    ('ix_conversations_user2_id', 'user2_id'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _ in REDUNDANT_INDEXES:
+            op.drop_index(
+                index_name,
+                table_name='conversations',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, column in REDUNDANT_INDEXES:
+            # Drop first: a failed earlier run leaves an INVALID index behind
+            op.drop_index(
+                index_name,
+                table_name='conversations',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.create_index(
+                index_name,
+                'conversations',
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,56 @@
+"""Index photos by (profile_id, order)
+
+Photo listings (WHERE profile_id = ? ORDER BY "order") and the gap fill
+after a deletion (WHERE profile_id = ? AND "order" > ?) become index
+range scans with no sort. The new index leads with profile_id, so it
+replaces ix_photos_profile_id. Both are built and dropped CONCURRENTLY
+so photos stays writable.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-01-02 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild_index(create_name: str, columns: list[str], drop_name: str) -> None:
+    """Build one photos index, then drop the one it replaces, without blocking writes"""
+    with op.get_context().autocommit_block():
+        # Drop first: a failed earlier run leaves an INVALID index behind
+        op.drop_index(
+            create_name,
+            table_name='photos',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            create_name,
+            'photos',
+            columns,
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            drop_name,
+            table_name='photos',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def upgrade() -> None:
+    _rebuild_index('ix_photos_profile_order', ['profile_id', 'order'], 'ix_photos_profile_id')
+
+
+def downgrade() -> None:
+    _rebuild_index('ix_photos_profile_id', ['profile_id'], 'ix_photos_profile_order')
@@ -0,0 +1,108 @@
+"""Enforce the photo order invariants in the database
+
+A profile's photos occupy positions 0..5, one photo per position. The
+service checks the count before inserting, but two concurrent uploads
+can both pass that check; these constraints make the database reject
+the loser instead of storing a seventh photo or a duplicate position.
+
+uq_photos_profile_order is DEFERRABLE (INITIALLY IMMEDIATE) so it is
+checked at the end of each statement rather than per row: reorders and
+the gap fill after a delete shift positions through transient
+duplicates within one UPDATE. Its index serves the same scans as
+ix_photos_profile_order, which is dropped.
+
+The unique index is built CONCURRENTLY and then attached with ADD
+CONSTRAINT ... USING INDEX; the CHECK is added NOT VALID and validated
+separately, which only blocks writes for the catalog updates.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-01-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Longest a statement may queue for a lock before the migration fails,
+# so it never stalls writers behind it. Concurrent builds run with no
+# timeout: they wait out open transactions without blocking anyone.
+LOCK_TIMEOUT = '5s'
+
+# Highest position: PhotoService.MAX_PHOTOS - 1
+MAX_ORDER = 5
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Safe to re-run: clear whatever an earlier failed run left behind
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute('ALTER TABLE photos DROP CONSTRAINT IF EXISTS uq_photos_profile_order')
+        op.execute('ALTER TABLE photos DROP CONSTRAINT IF EXISTS ck_photos_order')
+        
+        op.execute('SET lock_timeout = 0')
+        op.drop_index(
+            'uq_photos_profile_order',
+            table_name='photos',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'uq_photos_profile_order',
+            'photos',
+            ['profile_id', 'order'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute(
+            'ALTER TABLE photos ADD CONSTRAINT uq_photos_profile_order '
+            'UNIQUE USING INDEX uq_photos_profile_order DEFERRABLE INITIALLY IMMEDIATE'
+        )
+        op.execute(
+            'ALTER TABLE photos ADD CONSTRAINT ck_photos_order '
+            f'CHECK ("order" BETWEEN 0 AND {MAX_ORDER}) NOT VALID'
+        )
+        op.execute('ALTER TABLE photos VALIDATE CONSTRAINT ck_photos_order')
+        
+        op.execute('SET lock_timeout = 0')
+        op.drop_index(
+            'ix_photos_profile_order',
+            table_name='photos',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.execute('RESET lock_timeout')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('SET lock_timeout = 0')
+        # Drop first: a failed earlier run leaves an INVALID index behind
+        op.drop_index(
+            'ix_photos_profile_order',
+            table_name='photos',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            'ix_photos_profile_order',
+            'photos',
+            ['profile_id', 'order'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute('ALTER TABLE photos DROP CONSTRAINT IF EXISTS ck_photos_order')
+        op.execute('ALTER TABLE photos DROP CONSTRAINT IF EXISTS uq_photos_profile_order')
+        op.execute('RESET lock_timeout')
@@ -0,0 +1,110 @@
+"""Make the lower(email) index unique
+
+Login and the email checks match on lower(email), and register stores
+emails lowercased, but only the raw email column was unique: legacy rows
+such as 'Foo@x' and 'foo@x' could coexist, so lookups found two users
+and register's conflict check missed the case variant.
+
+Existing mixed-case emails are lowercased first. Case variants that
+belong to different accounts can't be merged automatically; the
+migration stops and lists them so they can be resolved by hand.
+
+ix_users_email_lower is then rebuilt as a UNIQUE index: built
+CONCURRENTLY under a temporary name and swapped in, so lookups keep an
+index throughout. An expression index can't back a constraint, but
+ON CONFLICT DO NOTHING still treats it as an arbiter.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-01-04 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Longest a statement may queue for a lock before the migration fails,
+# so it never stalls writers behind it. Concurrent builds run with no
+# timeout: they wait out open transactions without blocking anyone.
+LOCK_TIMEOUT = '5s'
+
+INDEX_NAME = 'ix_users_email_lower'
+
+
+def _normalize_emails() -> None:
+    """Lowercase stored emails, refusing to merge case variants"""
+    # Only rows whose lowercased email is free; variants are left as-is
+    op.execute("""
+        UPDATE users SET email = lower(email)
+        WHERE email <> lower(email)
+          AND NOT EXISTS (
+              SELECT 1 FROM users other
+              WHERE other.id <> users.id AND lower(other.email) = lower(users.email)
+          )
+    """)
+
+    if op.get_context().as_sql:
+        return
+
+    duplicates = op.get_bind().execute(
+        sa.text("""
+            SELECT lower(email) FROM users
+            GROUP BY lower(email) HAVING count(*) > 1
+            ORDER BY 1 LIMIT 20
+        """)
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Accounts differ only by email case and must be merged or renamed "
+            f"before ix_users_email_lower can be unique: {', '.join(duplicates)}"
+        )
+
+
+def _rebuild_email_index(unique: bool) -> None:
+    """Swap ix_users_email_lower for a (non-)unique build, without blocking writes"""
+    new_name = f'{INDEX_NAME}_new'
+    with op.get_context().autocommit_block():
+        op.execute('SET lock_timeout = 0')
+        # Drop first: a failed earlier run leaves an INVALID index behind
+        op.drop_index(
+            new_name,
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            new_name,
+            'users',
+            [sa.text('lower(email)')],
+            unique=unique,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            INDEX_NAME,
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+        op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        op.execute(f'ALTER INDEX {new_name} RENAME TO {INDEX_NAME}')
+        op.execute('RESET lock_timeout')
+
+
+def upgrade() -> None:
+    _normalize_emails()
+    _rebuild_email_index(unique=True)
+
+
+def downgrade() -> None:
+    # Emails stay lowercased; only the index loses its uniqueness
+    _rebuild_email_index(unique=False)
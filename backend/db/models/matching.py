@@ -1,11 +1,40 @@
 """Matching models for likes, passes, and matches"""
 
+import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import DateTime, ForeignKey, UniqueConstraint, CheckConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.sql import func
 
-from db.database import Base
+from db.database import Base, utc_now
+from db.uuidv7 import uuid7
+
+
+async def _insert_ignoring_duplicates(
+    session: AsyncSession, model: type, rows: list[dict]
+) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """Insert swipe rows in one multi-row INSERT, skipping existing pairs
+    
+    Args:
+        session: Database session (caller commits)
+        model: Like or Pass
+        rows: Dicts with user_id and target_id
+        
+    Returns:
+        (user_id, target_id) primary keys of the rows actually inserted
+    """
+    if not rows:
+        return []
+    
+    stmt = (
+        insert(model)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "target_id"])
+        .returning(model.user_id, model.target_id)
+    )
+    result = await session.execute(stmt)
+    return [tuple(row) for row in result.all()]
 
 
 class Like(Base):
@@ -13,42 +42,41 @@ class Like(Base):
     
     __tablename__ = "likes"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    
-    # User who liked
-    user_id: Mapped[str] = mapped_column(
-        String(36),
+    # Composite primary key: a user can only like another user once.
+    # The PK index leads with user_id, so it also serves lookups by user
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        primary_key=True
     )
     
     # User who was liked
-    target_id: Mapped[str] = mapped_column(
-        String(36),
+    target_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
+        primary_key=True,
         index=True
     )
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     
-    # Constraints
+    # Indexes
     __table_args__ = (
-        # Ensure a user can only like another user once
-        UniqueConstraint('user_id', 'target_id', name='uq_like_user_target'),
         # Index for finding mutual likes
         Index('ix_likes_target_user', 'target_id', 'user_id'),
     )
     
-    def __repr__(self) -> str:
-        return f"<Like(user_id={self.user_id}, target_id={self.target_id})>"
+    @classmethod
+    async def bulk_upsert(cls, session: AsyncSession, rows: list[dict]) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """Insert a batch of likes in one round trip, ignoring duplicates"""
+        return await _insert_ignoring_duplicates(session, cls, rows)
+    
+    __repr_fields__ = ("user_id", "target_id")
 
 
 class Pass(Base):
@@ -56,40 +84,35 @@ class Pass(Base):
     
     __tablename__ = "passes"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    
-    # User who passed
-    user_id: Mapped[str] = mapped_column(
-        String(36),
+    # Composite primary key: a user can only pass another user once.
+    # The PK index leads with user_id, so it also serves lookups by user
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        primary_key=True
     )
     
     # User who was passed
-    target_id: Mapped[str] = mapped_column(
-        String(36),
+    target_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
+        primary_key=True,
         index=True
     )
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     
-    # Constraints
-    __table_args__ = (
-        # Ensure a user can only pass another user once
-        UniqueConstraint('user_id', 'target_id', name='uq_pass_user_target'),
-    )
+    @classmethod
+    async def bulk_upsert(cls, session: AsyncSession, rows: list[dict]) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """Insert a batch of passes in one round trip, ignoring duplicates"""
+        return await _insert_ignoring_duplicates(session, cls, rows)
     
-    def __repr__(self) -> str:
-        return f"<Pass(user_id={self.user_id}, target_id={self.target_id})>"
+    __repr_fields__ = ("user_id", "target_id")
 
 
 class Match(Base):
@@ -97,42 +120,73 @@ class Match(Base):
     
     __tablename__ = "matches"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # First user in the match
-    user1_id: Mapped[str] = mapped_column(
-        String(36),
+    user1_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Covered by composite index below
     )
     
     # Second user in the match
-    user2_id: Mapped[str] = mapped_column(
-        String(36),
+    user2_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Covered by composite index below
     )
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False,
-        index=True  # Index for ordering by most recent
+        index=False  # BRIN index below (append-only column)
     )
     
     # Constraints
     __table_args__ = (
-        # Ensure only one match between two users
-        # We'll enforce user1_id < user2_id in application logic
+        # Ensure only one match between two users. Pairs are stored in
+        # canonical order, so "is there a match between A and B?" is a
+        # single probe on uq_match_users (see Match.ordered_pair)
+        CheckConstraint('user1_id < user2_id', name='ck_match_ordered'),
         UniqueConstraint('user1_id', 'user2_id', name='uq_match_users'),
-        # Index for finding matches for a user
-        Index('ix_matches_user1_created', 'user1_id', 'created_at'),
-        Index('ix_matches_user2_created', 'user2_id', 'created_at'),
+        # Covering indexes for a user's match list, newest first (backward
+        # scan). INCLUDE carries the other columns the list needs, so the
+        # scan is index-only and skips the heap
+        Index(
+            'ix_matches_user1_created',
+            'user1_id',
+            'created_at',
+            postgresql_include=['id', 'user2_id'],
+        ),
+        Index(
+            'ix_matches_user2_created',
+            'user2_id',
+            'created_at',
+            postgresql_include=['id', 'user1_id'],
+        ),
+        # BRIN index for time-range scans over all matches
+        Index(
+            'ix_matches_created_at',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
     )
     
-    def __repr__(self) -> str:
-        return f"<Match(id={self.id}, user1_id={self.user1_id}, user2_id={self.user2_id})>"
+    @staticmethod
+    def ordered_pair(user_a: uuid.UUID, user_b: uuid.UUID) -> tuple[uuid.UUID, uuid.UUID]:
+        """Return two user IDs as (user1_id, user2_id)
+        
+        Equivalent to (least(a, b), greatest(a, b)) in SQL; Python and
+        PostgreSQL order UUIDs the same way.
+        """
+        if user_a < user_b:
+            return user_a, user_b
+        return user_b, user_a
+    
+    __repr_fields__ = ("id", "user1_id", "user2_id")
@@ -1,11 +1,20 @@
 """Messaging models for conversations and messages"""
 
+import uuid
 from datetime import datetime
-from sqlalchemy import String, Text, Boolean, DateTime, ForeignKey, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from typing import Optional
+from sqlalchemy import DDL, Text, DateTime, ForeignKey, Index, event, inspect, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session, relationship
 
-from db.database import Base
+from db.database import Base, utc_now
+from db.uuidv7 import uuid7
+
+# Number of hash partitions for messages; must match the migrations
+MESSAGE_PARTITIONS = 16
+
+# Session.info key collecting recipients whose unread count changed
+_STALE_UNREAD_COUNTS = "stale_unread_counts"
 
 
 class Conversation(Base):
@@ -14,11 +23,11 @@ class Conversation(Base):
     __tablename__ = "conversations"
     
     # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
     
     # Foreign key to match
-    match_id: Mapped[str] = mapped_column(
-        String(36),
+    match_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("matches.id", ondelete="CASCADE"),
         unique=True,
         nullable=False,
@@ -26,39 +35,43 @@ class Conversation(Base):
     )
     
     # Participants (denormalized for easier querying)
-    user1_id: Mapped[str] = mapped_column(
-        String(36),
+    user1_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Covered by composite index below
     )
-    user2_id: Mapped[str] = mapped_column(
-        String(36),
+    user2_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Covered by composite index below
     )
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
+        onupdate=utc_now(),
         nullable=False,
         index=True  # Index for ordering conversations
     )
     
     # Relationships
+    # selectin: loading N conversations fetches all their messages in one
+    # extra `WHERE conversation_id IN (...)` query instead of N lazy loads.
+    # Inbox listings that don't show messages should pass noload/raiseload.
     messages: Mapped[list["Message"]] = relationship(
         "Message",
         back_populates="conversation",
         cascade="all, delete-orphan",
-        order_by="Message.created_at"
+        order_by="Message.created_at",
+        lazy="selectin"
     )
     
     # Indexes
@@ -68,8 +81,7 @@ class Conversation(Base):
         Index('ix_conversations_user2_updated', 'user2_id', 'updated_at'),
     )
     
-    def __repr__(self) -> str:
-        return f"<Conversation(id={self.id}, match_id={self.match_id})>"
+    __repr_fields__ = ("id", "match_id")
 
 
 class Message(Base):
@@ -77,58 +89,130 @@ class Message(Base):
     
     __tablename__ = "messages"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
-    # Foreign key to conversation
-    conversation_id: Mapped[str] = mapped_column(
-        String(36),
+    # Foreign key to conversation; also the hash partition key, which
+    # PostgreSQL requires in the primary key of a partitioned table
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("conversations.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        primary_key=True,
+        index=False  # Covered by composite index below
     )
     
     # Sender and recipient
-    sender_id: Mapped[str] = mapped_column(
-        String(36),
+    sender_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
     )
-    recipient_id: Mapped[str] = mapped_column(
-        String(36),
+    recipient_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Unread lookups use the partial index below
     )
     
     # Message content
     content: Mapped[str] = mapped_column(Text, nullable=False)
     
-    # Read status
-    read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Read status: when the recipient read it, NULL while unread
+    read_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=False),
+        nullable=True,
+        index=False  # Unread lookups use the partial index below
+    )
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False,
-        index=True  # Index for ordering messages
+        index=False  # BRIN index below (append-only column)
     )
     
     # Relationships
+    # raise_on_sql: implicit lazy loads fail loudly instead of issuing one
+    # query per message; load explicitly (or from the identity map)
     conversation: Mapped["Conversation"] = relationship(
         "Conversation",
-        back_populates="messages"
+        back_populates="messages",
+        lazy="raise_on_sql"
     )
     
     # Indexes
     __table_args__ = (
         # Index for finding messages in a conversation
         Index('ix_messages_conversation_created', 'conversation_id', 'created_at'),
-        # Index for finding unread messages for a user
-        Index('ix_messages_recipient_read', 'recipient_id', 'read'),
+        # BRIN index for time-range scans (retention/archival). created_at
+        # grows with insert order, so block-range summaries are ~1000x
+        # smaller than a B-tree and cheap to maintain on insert
+        Index(
+            'ix_messages_created_at',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
+        # Partial index for listing/counting unread messages for a user,
+        # newest first. Read messages drop out of it, so it stays small as
+        # history grows; INCLUDE makes the inbox query index-only
+        Index(
+            'ix_messages_recipient_unread',
+            'recipient_id',
+            'created_at',
+            postgresql_where=text('read_at IS NULL'),
+            postgresql_include=['id', 'sender_id'],
+        ),
+        # Hash-partitioned by conversation; the child partitions are
+        # created by the migrations (see 001_initial_schema) or by the
+        # after_create hook below for metadata.create_all
+        {'postgresql_partition_by': 'HASH (conversation_id)'},
     )
     
-    def __repr__(self) -> str:
-        return f"<Message(id={self.id}, sender_id={self.sender_id}, read={self.read})>"
+    __repr_fields__ = ("id", "sender_id", "read_at")
+
+
+# Create the hash partitions whenever the parent table is created through
+# metadata.create_all (tests), mirroring what 001_initial_schema does
+for _remainder in range(MESSAGE_PARTITIONS):
+    event.listen(
+        Message.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE messages_p{_remainder} PARTITION OF messages "
+            f"FOR VALUES WITH (MODULUS {MESSAGE_PARTITIONS}, REMAINDER {_remainder})"
+        ),
+    )
+
+
+# Unread count cache invalidation (db/cache/unread.py). Mapper events only
+# note which recipients changed; the Redis keys are deleted after commit,
+# so a rolled-back transaction never invalidates anything.
+@event.listens_for(Message, "after_insert")
+def _message_inserted(mapper, connection, target: Message) -> None:
+    session = object_session(target)
+    if session is not None and target.read_at is None:
+        session.info.setdefault(_STALE_UNREAD_COUNTS, set()).add(target.recipient_id)
+
+
+@event.listens_for(Message, "after_update")
+def _message_updated(mapper, connection, target: Message) -> None:
+    session = object_session(target)
+    if session is not None and inspect(target).attrs.read_at.history.has_changes():
+        session.info.setdefault(_STALE_UNREAD_COUNTS, set()).add(target.recipient_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_unread_counts(session: Session) -> None:
+    stale = session.info.pop(_STALE_UNREAD_COUNTS, None)
+    if stale:
+        # Imported here: db.cache.unread imports this module
+        from db.cache.unread import schedule_unread_count_invalidation
+        schedule_unread_count_invalidation(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_unread_counts(session: Session) -> None:
+    session.info.pop(_STALE_UNREAD_COUNTS, None)
@@ -1,12 +1,14 @@
 """Playground model for favorite playgrounds"""
 
+import uuid
 from datetime import datetime
 from sqlalchemy import String, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
 
-from db.database import Base
+from db.database import Base, utc_now
+from db.uuidv7 import uuid7
 
 
 class Playground(Base):
@@ -14,12 +16,12 @@ class Playground(Base):
     
     __tablename__ = "playgrounds"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign key to profile
-    user_id: Mapped[str] = mapped_column(
-        String(36),
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -38,18 +40,22 @@ class Playground(Base):
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     
     # Relationships
-    profile: Mapped["Profile"] = relationship("Profile", back_populates="playgrounds")
+    profile: Mapped["Profile"] = relationship(
+        "Profile",
+        back_populates="playgrounds",
+        primaryjoin="foreign(Playground.user_id) == Profile.user_id",
+        viewonly=True
+    )
     
     # Indexes on location for spatial queries
     __table_args__ = (
         # Spatial index will be created by Alembic migration
     )
     
-    def __repr__(self) -> str:
-        return f"<Playground(id={self.id}, name={self.name}, user_id={self.user_id})>"
+    __repr_fields__ = ("id", "name", "user_id")
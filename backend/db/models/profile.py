@@ -1,13 +1,19 @@
 """Profile model for user profiles"""
 
+import uuid
 from datetime import datetime
-from typing import Literal
-from sqlalchemy import String, Integer, Text, DateTime, Float, ForeignKey, Enum as SQLEnum
+from typing import Literal, get_args
+from sqlalchemy import (
+    DDL, String, Integer, Text, DateTime, Float, ForeignKey, Index, Enum as SQLEnum, event,
+    CheckConstraint, UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
 
-from db.database import Base
+from db.database import Base, utc_now
+from db.spatial import PROJECTED_SRID
+from db.uuidv7 import uuid7
 
 
 ActivityLevel = Literal['low', 'medium', 'high']
@@ -19,16 +25,16 @@ class Profile(Base):
     
     __tablename__ = "profiles"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign key to user
-    user_id: Mapped[str] = mapped_column(
-        String(36), 
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         unique=True,
         nullable=False,
-        index=True
+        index=False  # Covering index below
     )
     
     # Profile information
@@ -42,53 +48,100 @@ class Profile(Base):
         Geometry(geometry_type='POINT', srid=4326),
         nullable=True
     )
+    # Same point in a projected (planar, metre-based) SRID for distance
+    # math; maintained from `location` by a trigger, never written directly
+    location_projected: Mapped[str] = mapped_column(
+        Geometry(geometry_type='POINT', srid=PROJECTED_SRID, spatial_index=False),
+        nullable=True
+    )
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
+        onupdate=utc_now(),
         nullable=False
     )
     
     # Relationships
+    # passive_deletes: the child foreign keys are ON DELETE CASCADE, so
+    # deleting a profile doesn't load its photos, prompts and preferences
+    # first. delete-orphan still removes children dropped from a collection.
     user: Mapped["User"] = relationship("User", back_populates="profile")
     photos: Mapped[list["Photo"]] = relationship(
         "Photo",
         back_populates="profile",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Photo.order"
     )
     prompts: Mapped[list["Prompt"]] = relationship(
         "Prompt",
         back_populates="profile",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Prompt.order"
     )
     preferences: Mapped["UserPreferences"] = relationship(
         "UserPreferences",
         back_populates="profile",
         uselist=False,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
+    # Playgrounds belong to the user (playgrounds.user_id -> users.id), not
+    # to the profile row, so join through user_id. Read-only: the users FK's
+    # ON DELETE CASCADE removes them with the user.
     playgrounds: Mapped[list["Playground"]] = relationship(
         "Playground",
         back_populates="profile",
-        cascade="all, delete-orphan"
+        primaryjoin="Profile.user_id == foreign(Playground.user_id)",
+        viewonly=True
     )
     
-    # Indexes on location for spatial queries
+    # Indexes
     __table_args__ = (
-        # Spatial index will be created by Alembic migration
+        # Covering index for profile card lookups by user (index-only scan).
+        # Spatial index on location is created by Alembic migration
+        Index('ix_profiles_user_id', 'user_id', postgresql_include=['name', 'age']),
+        # SP-GiST suits point-only data better than GiST
+        Index(
+            'idx_profiles_location_projected',
+            'location_projected',
+            postgresql_using='spgist',
+        ),
     )
     
-    def __repr__(self) -> str:
-        return f"<Profile(id={self.id}, name={self.name}, age={self.age})>"
+    # Fetch server-generated timestamps with RETURNING on INSERT/UPDATE,
+    # so updated_at is current after a flush without a refresh query
+    __mapper_args__ = {"eager_defaults": True}
+    
+    __repr_fields__ = ("id", "name", "age")
+
+
+# Keep location_projected in step with location whenever the table is created
+# through metadata.create_all (tests), mirroring 004_projected_profile_location
+event.listen(
+    Profile.__table__,
+    "after_create",
+    DDL(f"""
+        CREATE OR REPLACE FUNCTION profiles_project_location() RETURNS trigger AS $$
+        BEGIN
+            NEW.location_projected := ST_Transform(NEW.location, {PROJECTED_SRID});
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER profiles_project_location
+        BEFORE INSERT OR UPDATE OF location ON profiles
+        FOR EACH ROW EXECUTE FUNCTION profiles_project_location();
+    """),
+)
 
 
 class Photo(Base):
@@ -96,15 +149,15 @@ class Photo(Base):
     
     __tablename__ = "photos"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign key to profile
-    profile_id: Mapped[str] = mapped_column(
-        String(36),
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("profiles.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
+        index=False  # Covered by composite index below
     )
     
     # Photo information
@@ -113,16 +166,30 @@ class Photo(Base):
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
         nullable=False
     )
     
     # Relationships
     profile: Mapped["Profile"] = relationship("Profile", back_populates="photos")
     
-    def __repr__(self) -> str:
-        return f"<Photo(id={self.id}, profile_id={self.profile_id}, order={self.order})>"
+    # Constraints
+    __table_args__ = (
+        # At most 6 photos (PhotoService.MAX_PHOTOS), in positions 0..5
+        CheckConstraint('"order" BETWEEN 0 AND 5', name='ck_photos_order'),
+        # One photo per position. Deferrable so reorders can shift
+        # positions within one UPDATE; its index also serves a profile's
+        # photos in display order as a range scan.
+        UniqueConstraint(
+            'profile_id', 'order',
+            name='uq_photos_profile_order',
+            deferrable=True,
+            initially='IMMEDIATE',
+        ),
+    )
+    
+    __repr_fields__ = ("id", "profile_id", "order")
 
 
 class Prompt(Base):
@@ -130,12 +197,12 @@ class Prompt(Base):
     
     __tablename__ = "prompts"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign key to profile
-    profile_id: Mapped[str] = mapped_column(
-        String(36),
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("profiles.id", ondelete="CASCADE"),
         nullable=False,
         index=True
@@ -158,12 +225,12 @@ class UserPreferences(Base):
     
     __tablename__ = "user_preferences"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Foreign key to profile
-    profile_id: Mapped[str] = mapped_column(
-        String(36),
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("profiles.id", ondelete="CASCADE"),
         unique=True,
         nullable=False,
@@ -174,13 +241,15 @@ class UserPreferences(Base):
     min_age: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     max_age: Mapped[int] = mapped_column(Integer, nullable=False, default=20)
     max_distance: Mapped[float] = mapped_column(Float, nullable=False, default=25.0)
-    activity_level: Mapped[str] = mapped_column(
-        SQLEnum('low', 'medium', 'high', name='activity_level_enum'),
+    # Native PostgreSQL enums (4-byte OIDs on disk, not text), with the
+    # labels taken from the Literal types the schemas validate against
+    activity_level: Mapped[ActivityLevel] = mapped_column(
+        SQLEnum(*get_args(ActivityLevel), name='activity_level_enum'),
         nullable=False,
         default='medium'
     )
-    distance_unit: Mapped[str] = mapped_column(
-        SQLEnum('miles', 'kilometers', name='distance_unit_enum'),
+    distance_unit: Mapped[DistanceUnit] = mapped_column(
+        SQLEnum(*get_args(DistanceUnit), name='distance_unit_enum'),
         nullable=False,
         default='miles'
     )
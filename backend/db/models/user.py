@@ -1,11 +1,13 @@
 """User model for authentication"""
 
+import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime
+from sqlalchemy import String, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
 
-from db.database import Base
+from db.database import Base, utc_now
+from db.uuidv7 import uuid7
 
 
 class User(Base):
@@ -13,8 +15,8 @@ class User(Base):
     
     __tablename__ = "users"
     
-    # Primary key
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Primary key (time-ordered, so inserts append to the index)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Authentication fields
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -22,24 +24,36 @@ class User(Base):
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), 
-        server_default=func.now(),
+        DateTime(timezone=False), 
+        server_default=utc_now(),
         nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
+        DateTime(timezone=False),
+        server_default=utc_now(),
+        onupdate=utc_now(),
         nullable=False
     )
     
     # Relationships
+    # raise_on_sql: an implicit lazy load (MissingGreenlet under asyncio,
+    # N+1 in loops) fails loudly; load it explicitly with selectinload.
+    # passive_deletes lets ON DELETE CASCADE remove the profile without
+    # loading it first.
     profile: Mapped["Profile"] = relationship(
         "Profile", 
         back_populates="user", 
         uselist=False,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql"
     )
     
-    def __repr__(self) -> str:
-        return f"<User(id={self.id}, email={self.email})>"
+    # Indexes
+    __table_args__ = (
+        # Case-insensitive email lookups (login/register match on lower(email));
+        # unique so case variants can't register twice (see 010_unique_lower_email)
+        Index('ix_users_email_lower', text('lower(email)'), unique=True),
+    )
+    
+    __repr_fields__ = ("id", "email")
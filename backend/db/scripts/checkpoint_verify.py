@@ -23,6 +23,7 @@ Or from the db/scripts directory:
 
 import asyncio
 import sys
+from collections import defaultdict
 from pathlib import Path
 import os
 
@@ -34,6 +35,26 @@ sys.path.insert(0, str(backend_dir))
 # Change to backend directory for relative paths
 os.chdir(backend_dir)
 
+# SQL for the database checks. Values are bound parameters (never
+# interpolated), so asyncpg can reuse prepared statements; sqlalchemy is
+# imported lazily inside each check to report missing dependencies
+EXTENSION_ENABLED_SQL = "SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = :name)"
+# Connection, extension, version and a function call in one round-trip
+POSTGIS_CHECK_SQL = """
+    SELECT 1,
+           EXISTS(SELECT 1 FROM pg_extension WHERE extname = :name),
+           PostGIS_Version(),
+           ST_Distance(ST_MakePoint(0, 0), ST_MakePoint(1, 1))
+"""
+TABLES_SQL = """
+    SELECT table_name FROM information_schema.tables
+    WHERE table_name = ANY(:names)
+"""
+INDEXES_SQL = """
+    SELECT tablename, indexname FROM pg_indexes
+    WHERE indexname = ANY(:names)
+"""
+
 # Color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -42,26 +63,56 @@ BLUE = '\033[94m'
 RESET = '\033[0m'
 
 
+# Output prefixes and header rule, formatted once
+_RULE = f"{BLUE}{'=' * 60}{RESET}\n"
+_OK = f"{GREEN}✓{RESET} "
+_ERR = f"{RED}✗{RESET} "
+_WARN = f"{YELLOW}⚠{RESET} "
+
+
 def print_header(text):
     """Print a section header"""
-    print(f"\n{BLUE}{'=' * 60}{RESET}")
-    print(f"{BLUE}{text}{RESET}")
-    print(f"{BLUE}{'=' * 60}{RESET}\n")
+    sys.stdout.write(f"\n{_RULE}{BLUE}{text}{RESET}\n{_RULE}\n")
 
 
 def print_success(text):
     """Print success message"""
-    print(f"{GREEN}✓{RESET} {text}")
+    sys.stdout.write(f"{_OK}{text}\n")
 
 
 def print_error(text):
     """Print error message"""
-    print(f"{RED}✗{RESET} {text}")
+    sys.stdout.write(f"{_ERR}{text}\n")
 
 
 def print_warning(text):
     """Print warning message"""
-    print(f"{YELLOW}⚠{RESET} {text}")
+    sys.stdout.write(f"{_WARN}{text}\n")
+
+
+def scan_paths(paths):
+    """Look up paths with one os.scandir per parent directory
+    
+    Avoids a separate stat syscall per path; DirEntry caches the file type.
+    
+    Returns:
+        Dict mapping each path to its os.DirEntry, or None if it is missing
+    """
+    by_parent = defaultdict(list)
+    for path in paths:
+        parent, _, name = path.rpartition("/")
+        by_parent[parent or "."].append((path, name))
+    
+    found = {}
+    for parent, items in by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        for path, name in items:
+            found[path] = entries.get(name)
+    return found
 
 
 def check_files():
@@ -88,8 +139,9 @@ def check_files():
     ]
     
     all_exist = True
+    entries = scan_paths(required_files)
     for filepath in required_files:
-        if Path(filepath).exists():
+        if entries[filepath] is not None:
             print_success(f"{filepath}")
         else:
             print_error(f"{filepath} - MISSING")
@@ -98,73 +150,83 @@ def check_files():
     return all_exist
 
 
-async def check_database():
-    """Check database connection and setup"""
+async def open_database(engine):
+    """Open the single connection shared by all database checks
+    
+    Returns:
+        An AUTOCOMMIT connection, or None if the database is unreachable
+    """
     print_header("2. Checking Database Connection")
     
+    try:
+        conn = await engine.connect()
+        # Autocommit so a failed probe can't abort the transaction for
+        # the checks that follow on the same connection
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        # Tell these probes apart from app traffic in pg_stat_activity;
+        # the connection is discarded (engine disposed) after the checks
+        await conn.exec_driver_sql("SET application_name = 'checkpoint_verify'")
+        return conn
+    except Exception as e:
+        print_error(f"Database connection error: {e}")
+        print_warning("Make sure PostgreSQL is running and DATABASE_URL is correct in .env")
+        return None
+
+
+async def check_database(conn):
+    """Check database connection and setup"""
     try:
         from sqlalchemy import text
-        from sqlalchemy.ext.asyncio import create_async_engine
-        from app.config import settings
-        
-        engine = create_async_engine(settings.DATABASE_URL, echo=False)
+        from sqlalchemy.exc import DBAPIError
         
         try:
-            async with engine.connect() as conn:
-                # Test basic connection
-                result = await conn.execute(text("SELECT 1"))
-                if result.scalar() == 1:
-                    print_success("Database connection successful")
-                else:
-                    print_error("Database connection failed")
-                    return False
-                
-                # Check PostGIS extension
-                result = await conn.execute(
-                    text("SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'postgis')")
-                )
-                if result.scalar():
-                    print_success("PostGIS extension is enabled")
-                else:
-                    print_error("PostGIS extension is NOT enabled")
-                    return False
-                
-                # Get PostGIS version
-                result = await conn.execute(text("SELECT PostGIS_Version()"))
-                version = result.scalar()
-                print_success(f"PostGIS version: {version}")
-                
-                # Test PostGIS functions
-                result = await conn.execute(
-                    text("SELECT ST_Distance(ST_MakePoint(0, 0), ST_MakePoint(1, 1))")
-                )
-                distance = result.scalar()
-                print_success(f"PostGIS functions working (test distance: {distance:.4f})")
-                
-                return True
-        finally:
-            await engine.dispose()
+            row = (await conn.execute(text(POSTGIS_CHECK_SQL), {"name": "postgis"})).one()
+        except DBAPIError:
+            # Without the extension PostGIS_Version() doesn't exist; only
+            # then is the separate extension probe worth a round-trip
+            result = await conn.execute(text(EXTENSION_ENABLED_SQL), {"name": "postgis"})
+            if result.scalar():
+                raise
+            print_success("Database connection successful")
+            print_error("PostGIS extension is NOT enabled")
+            return False
+        
+        ok, has_postgis, version, distance = row
+        
+        # Test basic connection
+        if ok == 1:
+            print_success("Database connection successful")
+        else:
+            print_error("Database connection failed")
+            return False
+        
+        # Check PostGIS extension
+        if has_postgis:
+            print_success("PostGIS extension is enabled")
+        else:
+            print_error("PostGIS extension is NOT enabled")
+            return False
+        
+        # Get PostGIS version
+        print_success(f"PostGIS version: {version}")
+        
+        # Test PostGIS functions
+        print_success(f"PostGIS functions working (test distance: {distance:.4f})")
+        
+        return True
             
-    except ImportError as e:
-        print_error(f"Missing dependencies: {e}")
-        print_warning("Run: pip install -r requirements.txt")
-        return False
     except Exception as e:
         print_error(f"Database connection error: {e}")
         print_warning("Make sure PostgreSQL is running and DATABASE_URL is correct in .env")
         return False
 
 
-async def check_tables():
+async def check_tables(conn):
     """Check that all tables exist"""
     print_header("3. Checking Database Tables")
     
     try:
         from sqlalchemy import text
-        from sqlalchemy.ext.asyncio import create_async_engine
-        from app.config import settings
-        
-        engine = create_async_engine(settings.DATABASE_URL, echo=False)
         
         expected_tables = [
             'users',
@@ -181,113 +243,118 @@ async def check_tables():
             'alembic_version'
         ]
         
-        try:
-            async with engine.connect() as conn:
-                all_exist = True
-                for table in expected_tables:
-                    result = await conn.execute(
-                        text(f"SELECT EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = '{table}')")
-                    )
-                    if result.scalar():
-                        print_success(f"Table '{table}' exists")
-                    else:
-                        print_error(f"Table '{table}' does NOT exist")
-                        all_exist = False
-                
-                if not all_exist:
-                    print_warning("Run migrations: alembic -c db/migrations/alembic.ini upgrade head")
-                
-                return all_exist
-        finally:
-            await engine.dispose()
+        # One round-trip for all tables instead of one per table
+        result = await conn.execute(text(TABLES_SQL), {"names": expected_tables})
+        found = {row[0] for row in result}
+        
+        all_exist = True
+        for table in expected_tables:
+            if table in found:
+                print_success(f"Table '{table}' exists")
+            else:
+                print_error(f"Table '{table}' does NOT exist")
+                all_exist = False
+        
+        if not all_exist:
+            print_warning("Run migrations: alembic -c db/migrations/alembic.ini upgrade head")
+        
+        return all_exist
             
     except Exception as e:
         print_error(f"Error checking tables: {e}")
         return False
 
 
-async def check_indexes():
+async def check_indexes(conn):
     """Check that important indexes exist"""
     print_header("4. Checking Database Indexes")
     
     try:
         from sqlalchemy import text
-        from sqlalchemy.ext.asyncio import create_async_engine
-        from app.config import settings
-        
-        engine = create_async_engine(settings.DATABASE_URL, echo=False)
         
         important_indexes = [
             ('users', 'ix_users_email'),
             ('profiles', 'ix_profiles_user_id'),
             ('profiles', 'idx_profiles_location'),  # Spatial index
-            ('likes', 'ix_likes_user_id'),
+            ('likes', 'likes_pkey'),
             ('matches', 'ix_matches_created_at'),
             ('playgrounds', 'idx_playgrounds_location'),  # Spatial index
         ]
         
-        try:
-            async with engine.connect() as conn:
-                all_exist = True
-                for table, index in important_indexes:
-                    result = await conn.execute(
-                        text(f"""
-                            SELECT EXISTS(
-                                SELECT 1 FROM pg_indexes 
-                                WHERE tablename = '{table}' 
-                                AND indexname = '{index}'
-                            )
-                        """)
-                    )
-                    if result.scalar():
-                        print_success(f"Index '{index}' on '{table}'")
-                    else:
-                        print_error(f"Index '{index}' on '{table}' does NOT exist")
-                        all_exist = False
-                
-                return all_exist
-        finally:
-            await engine.dispose()
+        # One round-trip for all indexes instead of one per index
+        result = await conn.execute(
+            text(INDEXES_SQL),
+            {"names": [index for _, index in important_indexes]},
+        )
+        found = {(row[0], row[1]) for row in result}
+        
+        all_exist = True
+        for table, index in important_indexes:
+            if (table, index) in found:
+                print_success(f"Index '{index}' on '{table}'")
+            else:
+                print_error(f"Index '{index}' on '{table}' does NOT exist")
+                all_exist = False
+        
+        return all_exist
             
     except Exception as e:
         print_error(f"Error checking indexes: {e}")
         return False
 
 
-async def check_redis():
-    """Check Redis connection"""
+async def probe_redis():
+    """Run the Redis round-trip without printing anything
+    
+    Prints nothing so it can run in the background while the database
+    checks report; check_redis prints the outcome afterwards.
+    
+    Returns:
+        Tuple of (PING reply, value read back after SET)
+    """
+    import redis.asyncio as redis
+    from app.config import settings
+    
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    
+    try:
+        # ping, set, get and delete in one round-trip
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.set("checkpoint_test", "success")
+            pipe.get("checkpoint_test")
+            pipe.delete("checkpoint_test")
+            pong, _, value, _ = await pipe.execute()
+        return pong, value
+    finally:
+        await client.close()
+
+
+async def check_redis(probe):
+    """Check Redis connection
+    
+    Args:
+        probe: Task running probe_redis(), started earlier
+    """
     print_header("5. Checking Redis Connection")
     
     try:
-        import redis.asyncio as redis
-        from app.config import settings
+        pong, value = await probe
         
-        client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        if pong:
+            print_success("Redis connection successful")
+        else:
+            print_error("Redis ping failed")
+            return False
         
-        try:
-            # Test ping
-            pong = await client.ping()
-            if pong:
-                print_success("Redis connection successful")
-            else:
-                print_error("Redis ping failed")
-                return False
-            
-            # Test set/get
-            await client.set("checkpoint_test", "success")
-            value = await client.get("checkpoint_test")
-            if value == "success":
-                print_success("Redis set/get operations working")
-            else:
-                print_error("Redis set/get operations failed")
-                return False
-            
-            # Clean up
-            await client.delete("checkpoint_test")
-            
-            return True
-        finally:
-            await client.close()
+        # Test set/get
+        if value == "success":
+            print_success("Redis set/get operations working")
+        else:
+            print_error("Redis set/get operations failed")
+            return False
+        
+        return True
             
     except ImportError as e:
         print_error(f"Missing dependencies: {e}")
@@ -299,60 +366,52 @@ async def check_redis():
         return False
 
 
+# (description, path) of each test suite, run in order
+TEST_SUITES = [
+    ("Configuration", "tests/test_config.py"),
+    ("Database setup", "db/tests/test_database_setup.py"),
+    ("Redis connection", "tests/test_redis_connection.py"),
+]
+
+
+def run_pytest(path):
+    """Run one test file with pytest in this interpreter
+    
+    Returns:
+        Tuple of (exit code, captured report output)
+    """
+    import contextlib
+    import io
+    import pytest
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        exit_code = pytest.main([path, "-v", "-p", "no:cacheprovider"])
+    return exit_code, output.getvalue()
+
+
 async def run_tests():
-    """Run pytest tests"""
+    """Run pytest tests
+    
+    Runs in-process (no interpreter start-up or re-imports per suite). Each
+    suite runs in a worker thread, since the async tests start their own
+    event loop and can't run inside this one.
+    """
     print_header("6. Running Tests")
     
     try:
-        import subprocess
-        
-        # Run config tests
-        print("Running configuration tests...")
-        result = subprocess.run(
-            ["python3", "-m", "pytest", "tests/test_config.py", "-v"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print_success("Configuration tests passed")
-        else:
-            print_error("Configuration tests failed")
-            print(result.stdout)
-            print(result.stderr)
-            return False
-        
-        # Run database tests
-        print("\nRunning database setup tests...")
-        result = subprocess.run(
-            ["python3", "-m", "pytest", "db/tests/test_database_setup.py", "-v"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print_success("Database setup tests passed")
-        else:
-            print_error("Database setup tests failed")
-            print(result.stdout)
-            print(result.stderr)
-            return False
-        
-        # Run Redis tests
-        print("\nRunning Redis connection tests...")
-        result = subprocess.run(
-            ["python3", "-m", "pytest", "tests/test_redis_connection.py", "-v"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print_success("Redis connection tests passed")
-        else:
-            print_error("Redis connection tests failed")
-            print(result.stdout)
-            print(result.stderr)
-            return False
+        for i, (name, path) in enumerate(TEST_SUITES):
+            if i:
+                print()
+            print(f"Running {name} tests...")
+            exit_code, output = await asyncio.to_thread(run_pytest, path)
+            
+            if exit_code == 0:
+                print_success(f"{name} tests passed")
+            else:
+                print_error(f"{name} tests failed")
+                print(output)
+                return False
         
         return True
         
@@ -369,22 +428,43 @@ async def main():
     
     results = {}
     
+    # Redis is independent of Postgres: start its round-trip now so it
+    # overlaps the file and database checks, and report it in order later
+    redis_probe = asyncio.create_task(probe_redis())
+    
     # Check files
     results['files'] = check_files()
     
-    # Check database
-    results['database'] = await check_database()
-    
-    # Check tables (only if database connection works)
-    if results['database']:
-        results['tables'] = await check_tables()
-        results['indexes'] = await check_indexes()
+    # Database checks share the process-wide engine and one connection
+    results['database'] = False
+    results['tables'] = False
+    results['indexes'] = False
+    try:
+        from db.engine import get_engine
+    except ImportError as e:
+        print_header("2. Checking Database Connection")
+        print_error(f"Missing dependencies: {e}")
+        print_warning("Run: pip install -r requirements.txt")
     else:
-        results['tables'] = False
-        results['indexes'] = False
+        engine = get_engine()
+        try:
+            conn = await open_database(engine)
+            if conn is not None:
+                try:
+                    results['database'] = await check_database(conn)
+                    # Check tables (only if database connection works)
+                    if results['database']:
+                        results['tables'] = await check_tables(conn)
+                        results['indexes'] = await check_indexes(conn)
+                finally:
+                    await conn.close()
+        finally:
+            # The engine stays usable, but its pooled connections are tied
+            # to this event loop and the in-process test run uses its own
+            await engine.dispose()
     
     # Check Redis
-    results['redis'] = await check_redis()
+    results['redis'] = await check_redis(redis_probe)
     
     # Run tests (only if everything else passes)
     if all(results.values()):
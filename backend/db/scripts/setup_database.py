@@ -9,8 +9,10 @@ This script:
 import asyncio
 import sys
 from pathlib import Path
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine
+from typing import Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
 
 # Add backend directory to path
 backend_dir = Path(__file__).parent.parent.parent
@@ -18,102 +20,124 @@ sys.path.insert(0, str(backend_dir))
 
 from app.config import settings
 
+# Statements with bound parameters, so asyncpg caches the prepared
+# statement instead of re-parsing
+DATABASE_EXISTS = "SELECT 1 FROM pg_database WHERE datname = $1"
+EXTENSION_ENABLED = "SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = $1)"
+POSTGIS_VERSION = "SELECT PostGIS_Version()"
+# Extension check and a function call in one round-trip
+POSTGIS_CHECK = """
+    SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = $1),
+           ST_Distance(ST_MakePoint(0, 0), ST_MakePoint(1, 1))
+"""
+
+
+def asyncpg_dsn(database: Optional[str] = None) -> str:
+    """Plain libpq DSN for DATABASE_URL (optionally another database on the same server)"""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    if database is not None:
+        url = url.set(database=database)
+    return url.render_as_string(hide_password=False)
+
 
 async def setup_database():
-    """Set up PostgreSQL database with PostGIS extension"""
+    """Set up PostgreSQL database with PostGIS extension
     
-    # Parse database URL to get connection info
-    db_url = settings.DATABASE_URL
-    
-    # Create connection to postgres database (not pupmatch)
-    # to create the pupmatch database if needed
-    base_url = db_url.rsplit('/', 1)[0] + '/postgres'
+    Uses two short-lived asyncpg connections rather than engines: there
+    is nothing to pool for a handful of DDL statements.
     
+    Returns:
+        Open connection to the application database, for verify_setup
+    """
+    # Connect to the postgres database (not pupmatch) to create the
+    # pupmatch database if needed. asyncpg autocommits outside explicit
+    # transactions, which CREATE DATABASE requires.
     print("Connecting to PostgreSQL...")
-    engine = create_async_engine(base_url, isolation_level="AUTOCOMMIT")
+    sys_conn = await asyncpg.connect(dsn=asyncpg_dsn("postgres"))
     
     try:
-        async with engine.connect() as conn:
-            # Check if database exists
-            result = await conn.execute(
-                text("SELECT 1 FROM pg_database WHERE datname = 'pupmatch'")
-            )
-            exists = result.scalar()
-            
-            if not exists:
-                print("Creating pupmatch database...")
-                await conn.execute(text("CREATE DATABASE pupmatch"))
-                print("✓ Database created")
-            else:
-                print("✓ Database already exists")
+        # Check if database exists
+        exists = await sys_conn.fetchval(DATABASE_EXISTS, "pupmatch")
+        
+        if not exists:
+            print("Creating pupmatch database...")
+            await sys_conn.execute("CREATE DATABASE pupmatch")
+            print("✓ Database created")
+        else:
+            print("✓ Database already exists")
     
     finally:
-        await engine.dispose()
+        await sys_conn.close()
     
     # Now connect to pupmatch database to enable PostGIS
     print("\nEnabling PostGIS extension...")
-    engine = create_async_engine(settings.DATABASE_URL)
+    conn = await asyncpg.connect(
+        dsn=asyncpg_dsn(),
+        statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+    )
     
     try:
-        async with engine.connect() as conn:
-            # Enable PostGIS extension
-            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
-            await conn.commit()
-            
-            # Verify PostGIS installation
-            result = await conn.execute(text("SELECT PostGIS_Version()"))
-            version = result.scalar()
-            print(f"✓ PostGIS enabled (version: {version})")
-            
-            # Verify connection pooling settings
-            print(f"\n✓ Connection pool configured:")
-            print(f"  - Pool size: {settings.DATABASE_POOL_SIZE}")
-            print(f"  - Max overflow: {settings.DATABASE_MAX_OVERFLOW}")
-            
-    finally:
-        await engine.dispose()
+        # Enable PostGIS extension
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+        
+        # Verify PostGIS installation
+        version = await conn.fetchval(POSTGIS_VERSION)
+        print(f"✓ PostGIS enabled (version: {version})")
+        
+        # Verify connection pooling settings
+        print(f"\n✓ Connection pool configured:")
+        print(f"  - Pool size: {settings.DATABASE_POOL_SIZE}")
+        print(f"  - Max overflow: {settings.DATABASE_MAX_OVERFLOW}")
+        print(f"  - Recycle after: {settings.DATABASE_POOL_RECYCLE}s")
+    except BaseException:
+        await conn.close()
+        raise
     
     print("\n✅ Database setup complete!")
-    return True
+    return conn
 
 
-async def verify_setup():
-    """Verify database setup"""
-    print("\nVerifying database setup...")
+async def verify_setup(conn):
+    """Verify database setup
     
-    engine = create_async_engine(settings.DATABASE_URL)
+    Args:
+        conn: asyncpg connection to the application database
+    """
+    print("\nVerifying database setup...")
     
     try:
-        async with engine.connect() as conn:
-            # Check PostGIS
-            result = await conn.execute(
-                text("SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'postgis')")
-            )
-            has_postgis = result.scalar()
-            
-            if has_postgis:
-                print("✓ PostGIS extension is enabled")
-            else:
-                print("✗ PostGIS extension is NOT enabled")
-                return False
-            
-            # Test a simple geospatial query
-            result = await conn.execute(
-                text("SELECT ST_Distance(ST_MakePoint(0, 0), ST_MakePoint(1, 1))")
-            )
-            distance = result.scalar()
-            print(f"✓ PostGIS functions working (test distance: {distance:.4f})")
-            
-    finally:
-        await engine.dispose()
+        has_postgis, distance = await conn.fetchrow(POSTGIS_CHECK, "postgis")
+    except asyncpg.UndefinedFunctionError:
+        # ST_Distance doesn't exist without the extension
+        has_postgis = await conn.fetchval(EXTENSION_ENABLED, "postgis")
+        if has_postgis:
+            raise
+    
+    # Check PostGIS
+    if has_postgis:
+        print("✓ PostGIS extension is enabled")
+    else:
+        print("✗ PostGIS extension is NOT enabled")
+        return False
+    
+    # Test a simple geospatial query
+    print(f"✓ PostGIS functions working (test distance: {distance:.4f})")
     
     return True
 
 
+async def main():
+    """Set up and verify the database over one application connection"""
+    conn = await setup_database()
+    try:
+        await verify_setup(conn)
+    finally:
+        await conn.close()
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(setup_database())
-        asyncio.run(verify_setup())
+        asyncio.run(main())
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -1,18 +1,45 @@
 """Verify backend setup without requiring external dependencies"""
 
 import os
+import re
 import sys
-from pathlib import Path
+from collections import defaultdict
 
+# Distribution name at the start of a requirements line (before extras,
+# version specifiers, markers or comments)
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)", re.M)
+# Variable name of a KEY=value line in an env file
+ENV_VAR_NAME = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=", re.M)
 
-def check_file_exists(filepath: str) -> bool:
-    """Check if a file exists"""
-    return Path(filepath).exists()
 
+def canonical_name(name: str) -> str:
+    """Normalize a distribution name (PEP 503: case, '_' and '.' are insignificant)"""
+    return re.sub(r"[-_.]+", "-", name).lower()
 
-def check_directory_exists(dirpath: str) -> bool:
-    """Check if a directory exists"""
-    return Path(dirpath).is_dir()
+
+def scan_paths(paths):
+    """Look up paths with one os.scandir per parent directory
+    
+    Avoids a separate stat syscall per path; DirEntry caches the file type.
+    
+    Returns:
+        Dict mapping each path to its os.DirEntry, or None if it is missing
+    """
+    by_parent = defaultdict(list)
+    for path in paths:
+        parent, _, name = path.rpartition("/")
+        by_parent[parent or "."].append((path, name))
+    
+    found = {}
+    for parent, items in by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        for path, name in items:
+            found[path] = entries.get(name)
+    return found
 
 
 def verify_project_structure():
@@ -57,15 +84,17 @@ def verify_project_structure():
     }
     
     all_passed = True
+    entries = scan_paths([item for items in checks.values() for item in items])
     
     for category, items in checks.items():
         print(f"📁 {category}:")
         for item in items:
+            entry = entries[item]
             # Check if it's a directory (no extension or explicit directory)
             if "/" in item and not any(item.endswith(ext) for ext in [".py", ".toml", ".txt", ".ini", ".md", ".mako"]):
-                exists = check_directory_exists(item)
+                exists = entry is not None and entry.is_dir()
             else:
-                exists = check_file_exists(item)
+                exists = entry is not None
             
             symbol = "✅" if exists else "❌"
             print(f"  {symbol} {item}")
@@ -89,17 +118,18 @@ def verify_dependencies():
         "redis",
         "celery",
         "boto3",
-        "python-jose",
+        "pyjwt",
         "pytest",
         "hypothesis",
     ]
     
+    # Exact names, so e.g. "redis" is not satisfied by "hiredis"
     with open("requirements.txt", "r") as f:
-        content = f.read().lower()
+        installed = {canonical_name(name) for name in REQUIREMENT_NAME.findall(f.read())}
     
     all_found = True
     for package in required_packages:
-        found = package in content
+        found = canonical_name(package) in installed
         symbol = "✅" if found else "❌"
         print(f"  {symbol} {package}")
         if not found:
@@ -121,12 +151,13 @@ def verify_environment_config():
         "CELERY_BROKER_URL",
     ]
     
+    # Only defined variables count, not mentions in comments or values
     with open(".env.example", "r") as f:
-        content = f.read()
+        defined = set(ENV_VAR_NAME.findall(f.read()))
     
     all_found = True
     for var in required_vars:
-        found = var in content
+        found = var in defined
         symbol = "✅" if found else "❌"
         print(f"  {symbol} {var}")
         if not found:
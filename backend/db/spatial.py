@@ -0,0 +1,50 @@
+"""Spatial helpers for distance queries on projected geometry"""
+
+import math
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement
+
+# Web Mercator: planar coordinates in metres, so ST_DWithin runs as cheap
+# Cartesian math instead of spheroidal distance calculations
+PROJECTED_SRID = 3857
+
+
+def projected_radius(meters: float, latitude: float) -> float:
+    """Convert a ground distance into Web Mercator units at a latitude
+
+    Mercator stretches distances by 1/cos(latitude), so the search radius
+    is scaled up by the same factor to cover the intended ground distance.
+
+    Args:
+        meters: Distance on the ground in metres
+        latitude: Latitude of the search origin in degrees
+
+    Returns:
+        Equivalent radius in EPSG:3857 units
+    """
+    return meters / math.cos(math.radians(latitude))
+
+
+def within_distance(
+    projected_column,
+    latitude: float,
+    longitude: float,
+    meters: float,
+) -> ColumnElement[bool]:
+    """Build an index-assisted ST_DWithin filter around a WGS84 point
+
+    Args:
+        projected_column: Geometry column in PROJECTED_SRID (e.g. Profile.location_projected)
+        latitude: Latitude of the search origin in degrees
+        longitude: Longitude of the search origin in degrees
+        meters: Search radius on the ground in metres
+
+    Returns:
+        Boolean SQL expression usable in a WHERE clause
+    """
+    origin = func.ST_Transform(
+        func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326),
+        PROJECTED_SRID,
+    )
+    return func.ST_DWithin(projected_column, origin, projected_radius(meters, latitude))
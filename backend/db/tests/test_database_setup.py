@@ -1,19 +1,24 @@
 """Tests for database setup and connectivity"""
 
+import json
+
 import pytest
-import pytest_asyncio
-from sqlalchemy import text
+from sqlalchemy import DateTime, select, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
 
-@pytest_asyncio.fixture
-async def db_engine():
-    """Create a database engine for testing"""
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
-    yield engine
-    await engine.dispose()
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create one database engine for the whole test session
+    
+    NullPool keeps no connections between tests, so the shared engine is
+    never bound to the event loop of the test that happened to open them.
+    """
+    return create_async_engine(settings.DATABASE_URL, echo=False, poolclass=NullPool)
 
 
 @pytest.mark.asyncio
@@ -39,13 +44,16 @@ async def test_postgis_extension_enabled(db_engine):
 async def test_postgis_functions_work(db_engine):
     """Test that PostGIS functions are working"""
     async with db_engine.connect() as conn:
-        # Test ST_MakePoint and ST_Distance functions
+        # Test ST_MakePoint and ST_DWithin functions (distance is sqrt(2))
         result = await conn.execute(
-            text("SELECT ST_Distance(ST_MakePoint(0, 0), ST_MakePoint(1, 1))")
+            text("""
+                SELECT ST_DWithin(ST_MakePoint(0, 0), ST_MakePoint(1, 1), 1.5),
+                       ST_DWithin(ST_MakePoint(0, 0), ST_MakePoint(1, 1), 1.4)
+            """)
         )
-        distance = result.scalar()
-        assert distance is not None
-        assert distance > 0
+        within, beyond = result.one()
+        assert within is True
+        assert beyond is False
         
         # Test ST_GeomFromText function
         result = await conn.execute(
@@ -74,62 +82,85 @@ async def test_database_tables_exist(db_engine):
     ]
     
     async with db_engine.connect() as conn:
-        for table in expected_tables:
-            result = await conn.execute(
-                text(f"SELECT EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = '{table}')")
-            )
-            exists = result.scalar()
-            assert exists is True, f"Table '{table}' does not exist"
+        result = await conn.execute(
+            text("SELECT table_name FROM information_schema.tables WHERE table_name = ANY(:names)"),
+            {"names": expected_tables},
+        )
+        existing = set(result.scalars())
+    
+    missing = [table for table in expected_tables if table not in existing]
+    assert missing == [], f"Tables do not exist: {missing}"
 
 
 @pytest.mark.asyncio
 async def test_spatial_indexes_exist(db_engine):
     """Test that spatial indexes are created"""
     async with db_engine.connect() as conn:
-        # Check for profiles location index
-        result = await conn.execute(
-            text("""
-                SELECT EXISTS(
-                    SELECT 1 FROM pg_indexes 
-                    WHERE tablename = 'profiles' 
-                    AND indexname = 'idx_profiles_location'
-                )
-            """)
-        )
-        has_profiles_index = result.scalar()
-        assert has_profiles_index is True, "Spatial index on profiles.location does not exist"
-        
-        # Check for playgrounds location index
+        # Both location indexes in one query
         result = await conn.execute(
             text("""
-                SELECT EXISTS(
-                    SELECT 1 FROM pg_indexes 
-                    WHERE tablename = 'playgrounds' 
-                    AND indexname = 'idx_playgrounds_location'
-                )
+                SELECT
+                    bool_or(tablename = 'profiles' AND indexname = 'idx_profiles_location'),
+                    bool_or(tablename = 'playgrounds' AND indexname = 'idx_playgrounds_location')
+                FROM pg_indexes
+                WHERE tablename IN ('profiles', 'playgrounds')
             """)
         )
-        has_playgrounds_index = result.scalar()
-        assert has_playgrounds_index is True, "Spatial index on playgrounds.location does not exist"
+        has_profiles_index, has_playgrounds_index = result.one()
+    
+    assert has_profiles_index is True, "Spatial index on profiles.location does not exist"
+    assert has_playgrounds_index is True, "Spatial index on playgrounds.location does not exist"
+
+
+def _plan_index_names(node: dict) -> set[str]:
+    """Collect every "Index Name" in an EXPLAIN (FORMAT JSON) plan tree"""
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= _plan_index_names(child)
+    return names
+
+
+@pytest.mark.asyncio
+async def test_radius_search_uses_spatial_index(db_engine):
+    """Test that within_distance radius filters can be answered from the spatial index
+    
+    Guards against radius searches written as ST_Distance(...) < r, or
+    against a geography cast of location, neither of which can use it.
+    """
+    from db.models import Profile
+    from db.spatial import within_distance
+    
+    query = select(Profile.id).where(
+        within_distance(Profile.location_projected, 37.7749, -122.4194, 40233.6)
+    )
+    sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    
+    async with db_engine.connect() as conn:
+        # Small test tables would otherwise be scanned sequentially. SET
+        # LOCAL ends with the transaction, which is rolled back on close.
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        plan = result.scalar()
+    
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    assert "idx_profiles_location_projected" in _plan_index_names(plan[0]["Plan"])
 
 
 @pytest.mark.asyncio
 async def test_enum_types_exist(db_engine):
     """Test that custom enum types are created"""
+    expected_types = ['activity_level_enum', 'distance_unit_enum']
+    
     async with db_engine.connect() as conn:
-        # Check for activity_level_enum
         result = await conn.execute(
-            text("SELECT EXISTS(SELECT 1 FROM pg_type WHERE typname = 'activity_level_enum')")
+            text("SELECT typname FROM pg_type WHERE typname = ANY(:names)"),
+            {"names": expected_types},
         )
-        has_activity_level = result.scalar()
-        assert has_activity_level is True, "activity_level_enum type does not exist"
-        
-        # Check for distance_unit_enum
-        result = await conn.execute(
-            text("SELECT EXISTS(SELECT 1 FROM pg_type WHERE typname = 'distance_unit_enum')")
-        )
-        has_distance_unit = result.scalar()
-        assert has_distance_unit is True, "distance_unit_enum type does not exist"
+        existing = set(result.scalars())
+    
+    missing = [name for name in expected_types if name not in existing]
+    assert missing == [], f"Enum types do not exist: {missing}"
 
 
 @pytest.mark.asyncio
@@ -154,33 +185,39 @@ async def test_foreign_key_constraints_exist(db_engine):
 async def test_unique_constraints_exist(db_engine):
     """Test that unique constraints are properly set up"""
     async with db_engine.connect() as conn:
-        # Check users email unique constraint
+        # users.email unique constraint and likes (user_id, target_id)
+        # primary key in one query
         result = await conn.execute(
             text("""
-                SELECT EXISTS(
-                    SELECT 1 FROM information_schema.table_constraints 
-                    WHERE constraint_type = 'UNIQUE' 
-                    AND table_name = 'users'
-                    AND constraint_name LIKE '%email%'
-                )
+                SELECT
+                    bool_or(constraint_type = 'UNIQUE' AND table_name = 'users'
+                            AND constraint_name LIKE '%email%'),
+                    bool_or(constraint_type = 'PRIMARY KEY' AND table_name = 'likes'
+                            AND constraint_name = 'likes_pkey')
+                FROM information_schema.table_constraints
+                WHERE table_name IN ('users', 'likes')
             """)
         )
-        has_unique = result.scalar()
-        assert has_unique is True, "Unique constraint on users.email does not exist"
-        
-        # Check likes unique constraint
+        has_unique, has_like_pk = result.one()
+    
+    assert has_unique is True, "Unique constraint on users.email does not exist"
+    assert has_like_pk is True, "Primary key on likes (user_id, target_id) does not exist"
+
+
+@pytest.mark.asyncio
+async def test_email_lower_index_is_unique(db_engine):
+    """Test that emails differing only by case can't belong to two users"""
+    async with db_engine.connect() as conn:
         result = await conn.execute(
             text("""
-                SELECT EXISTS(
-                    SELECT 1 FROM information_schema.table_constraints 
-                    WHERE constraint_type = 'UNIQUE' 
-                    AND table_name = 'likes'
-                    AND constraint_name = 'uq_like_user_target'
-                )
+                SELECT i.indisunique FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = 'ix_users_email_lower'
             """)
         )
-        has_like_unique = result.scalar()
-        assert has_like_unique is True, "Unique constraint on likes (user_id, target_id) does not exist"
+        is_unique = result.scalar()
+    
+    assert is_unique is True, "ix_users_email_lower is missing or not unique"
 
 
 @pytest.mark.asyncio
@@ -189,25 +226,26 @@ async def test_indexes_exist(db_engine):
     expected_indexes = [
         ('users', 'ix_users_email'),
         ('profiles', 'ix_profiles_user_id'),
-        ('likes', 'ix_likes_user_id'),
+        ('photos', 'uq_photos_profile_order'),
+        ('likes', 'likes_pkey'),
         ('likes', 'ix_likes_target_id'),
         ('matches', 'ix_matches_created_at'),
-        ('messages', 'ix_messages_conversation_id'),
+        ('messages', 'ix_messages_conversation_created'),
     ]
     
     async with db_engine.connect() as conn:
-        for table, index in expected_indexes:
-            result = await conn.execute(
-                text(f"""
-                    SELECT EXISTS(
-                        SELECT 1 FROM pg_indexes 
-                        WHERE tablename = '{table}' 
-                        AND indexname = '{index}'
-                    )
-                """)
-            )
-            exists = result.scalar()
-            assert exists is True, f"Index '{index}' on table '{table}' does not exist"
+        result = await conn.execute(
+            text("SELECT tablename, indexname FROM pg_indexes WHERE indexname = ANY(:names)"),
+            {"names": [index for _, index in expected_indexes]},
+        )
+        existing = set(result.tuples())
+    
+    missing = [
+        f"'{index}' on table '{table}'"
+        for table, index in expected_indexes
+        if (table, index) not in existing
+    ]
+    assert missing == [], f"Indexes do not exist: {missing}"
 
 
 @pytest.mark.asyncio
@@ -223,3 +261,61 @@ async def test_cascade_delete_configured(db_engine):
         )
         cascade_count = result.scalar()
         assert cascade_count > 0, "No CASCADE delete rules found on foreign keys"
+
+
+@pytest.mark.asyncio
+async def test_timestamp_columns_store_naive_utc(db_engine):
+    """Test that every timestamp column is `timestamp without time zone`"""
+    async with db_engine.connect() as conn:
+        result = await conn.execute(
+            text("""
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = 'public'
+                AND data_type = 'timestamp with time zone'
+            """)
+        )
+        tz_columns = result.all()
+        assert tz_columns == [], f"Columns still using timestamptz: {tz_columns}"
+
+
+def test_model_timestamps_default_to_utc():
+    """Test that model timestamps are naive and default to UTC, never local time"""
+    from db.database import Base
+    import db.models  # noqa: F401 - registers every model on Base.metadata
+    
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if not isinstance(column.type, DateTime):
+                continue
+            assert column.type.timezone is False, f"{table.name}.{column.name} is timezone-aware"
+            if column.nullable:
+                continue  # Event timestamps (e.g. messages.read_at) have no default
+            default = column.server_default.arg.compile(compile_kwargs={"literal_binds": True})
+            assert "'utc'" in str(default), f"{table.name}.{column.name} does not default to UTC"
+
+
+def test_model_repr_lists_declared_fields():
+    """Test that model reprs come from __repr_fields__ in declaration order"""
+    import uuid
+    from db.models import User
+    
+    user_id = uuid.uuid4()
+    user = User(id=user_id, email="rex@example.com")
+    assert repr(user) == f"<User(id={user_id}, email=rex@example.com)>"
+
+
+@pytest.mark.asyncio
+async def test_id_columns_use_native_uuid(db_engine):
+    """Test that primary and foreign key id columns are 16-byte `uuid`, not text"""
+    async with db_engine.connect() as conn:
+        result = await conn.execute(
+            text("""
+                SELECT table_name, column_name, data_type FROM information_schema.columns
+                WHERE table_schema = 'public'
+                AND (column_name = 'id' OR column_name LIKE '%\\_id')
+                AND table_name NOT LIKE 'messages\\_p%'
+                AND data_type <> 'uuid'
+            """)
+        )
+        text_ids = result.all()
+        assert text_ids == [], f"Id columns not stored as uuid: {text_ids}"
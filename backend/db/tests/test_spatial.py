@@ -0,0 +1,15 @@
+"""Tests for projected distance helpers"""
+
+import pytest
+
+from db.spatial import projected_radius
+
+
+def test_projected_radius_at_equator():
+    """Test that Mercator units equal metres at the equator"""
+    assert projected_radius(1000, 0) == pytest.approx(1000)
+
+
+def test_projected_radius_scales_with_latitude():
+    """Test that the radius is stretched by 1/cos(latitude)"""
+    assert projected_radius(1000, 60) == pytest.approx(2000)
@@ -0,0 +1,28 @@
+"""Tests for UUIDv7 generation"""
+
+import time
+
+from db.uuidv7 import uuid7
+
+
+def test_uuid7_version_and_variant():
+    """Test that generated IDs are RFC 4122 variant, version 7"""
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_embeds_timestamp():
+    """Test that the top 48 bits hold the current Unix time in milliseconds"""
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_sorts_by_creation_time():
+    """Test that IDs from later milliseconds sort after earlier ones"""
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first < second
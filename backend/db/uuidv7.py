@@ -0,0 +1,24 @@
+"""Time-ordered UUIDv7 generation (RFC 9562)"""
+
+import os
+import time
+import uuid
+
+_VERSION_MASK = 0xF << 76
+_VARIANT_MASK = 0x3 << 62
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a UUIDv7: 48-bit Unix millisecond timestamp, then random bits
+
+    New IDs sort after older ones, so primary key inserts land on the
+    rightmost B-tree leaf instead of a random page.
+
+    Returns:
+        A version 7, RFC 4122 variant UUID
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~_VERSION_MASK) | (0x7 << 76)
+    value = (value & ~_VARIANT_MASK) | (0x2 << 62)
+    return uuid.UUID(int=value)
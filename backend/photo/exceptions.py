@@ -11,6 +11,11 @@ class InvalidPhotoCountError(Exception):
     pass
 
 
+class PhotoConflictError(Exception):
+    """Raised when a concurrent change to the same profile's photos won"""
+    pass
+
+
 class ProfileNotFoundError(Exception):
     """Raised when profile is not found"""
     pass
@@ -6,28 +6,46 @@ Suitable for development and testing.
 For production, use S3Storage, GCSStorage, or R2Storage instead.
 """
 
+import asyncio
 import os
+import re
 import uuid
-import aiofiles
+from contextlib import suppress
 from pathlib import Path
-from typing import BinaryIO
+import aiofiles.os
+from typing import BinaryIO, Optional
 
 from photo.storage_interface import StorageService
 
+# Filename of a URL produced by upload(). A plain name (no separators, not
+# "." / ".." or a hidden temp file), so a crafted URL can't reach outside
+# the upload directory
+_PHOTO_URL_RE = re.compile(r"/uploads/photos/([A-Za-z0-9][A-Za-z0-9._-]*)\Z")
+
 
 class LocalStorage(StorageService):
     """Local filesystem storage implementation"""
     
     # Allowed file types (MIME types)
-    ALLOWED_TYPES = {
+    ALLOWED_TYPES = frozenset({
         'image/jpeg',
         'image/png',
         'image/webp',
-    }
+    })
+    
+    # Allowed filename extensions
+    ALLOWED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
+    
+    # Error message fragments, joined once rather than per rejection
+    _ALLOWED_TYPES_TEXT = ', '.join(sorted(ALLOWED_TYPES))
+    _ALLOWED_EXTENSIONS_TEXT = ', '.join(sorted(ALLOWED_EXTENSIONS))
     
     # Maximum file size (10MB)
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
     
+    # Bytes read and written per step while streaming an upload
+    CHUNK_SIZE = 64 * 1024
+    
     def __init__(self, upload_dir: str = "uploads/photos"):
         """Initialize local storage
         
@@ -35,19 +53,26 @@ class LocalStorage(StorageService):
             upload_dir: Directory to store uploaded files
         """
         self.upload_dir = Path(upload_dir)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Created on first upload (see _ensure_upload_dir), off the event loop
+        self._upload_dir_ready = False
         
         # Base URL for accessing files
         # In production, this would be your domain
         self.base_url = os.getenv("BASE_URL", "http://localhost:8000")
     
-    def validate_file(self, filename: str, content_type: str, file_size: int) -> None:
+    def validate_file(
+        self,
+        filename: str,
+        content_type: str,
+        file_size: Optional[int] = None
+    ) -> None:
         """Validate file before upload
         
         Args:
             filename: Original filename
             content_type: MIME type
-            file_size: File size in bytes
+            file_size: File size in bytes, if known before reading
             
         Raises:
             ValueError: If file is invalid
@@ -56,10 +81,23 @@ class LocalStorage(StorageService):
         if content_type not in self.ALLOWED_TYPES:
             raise ValueError(
                 f"Invalid file type: {content_type}. "
-                f"Allowed types: {', '.join(self.ALLOWED_TYPES)}"
+                f"Allowed types: {self._ALLOWED_TYPES_TEXT}"
             )
         
-        # Validate file size
+        # Validate file size (upload() enforces it again while streaming)
+        if file_size is not None:
+            self._validate_size(file_size)
+        
+        # Validate filename extension
+        ext = Path(filename).suffix.lower()
+        if ext not in self.ALLOWED_EXTENSIONS:
+            raise ValueError(
+                f"Invalid file extension: {ext}. "
+                f"Allowed extensions: {self._ALLOWED_EXTENSIONS_TEXT}"
+            )
+    
+    def _validate_size(self, file_size: int) -> None:
+        """Raise ValueError if file_size exceeds MAX_FILE_SIZE"""
         if file_size > self.MAX_FILE_SIZE:
             max_mb = self.MAX_FILE_SIZE / (1024 * 1024)
             actual_mb = file_size / (1024 * 1024)
@@ -67,54 +105,86 @@ class LocalStorage(StorageService):
                 f"File too large: {actual_mb:.2f}MB. "
                 f"Maximum size: {max_mb:.0f}MB"
             )
-        
-        # Validate filename extension
-        ext = Path(filename).suffix.lower()
-        valid_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
-        if ext not in valid_extensions:
-            raise ValueError(
-                f"Invalid file extension: {ext}. "
-                f"Allowed extensions: {', '.join(valid_extensions)}"
-            )
     
     async def upload(self, file: BinaryIO, filename: str, content_type: str) -> str:
         """Upload file to local filesystem
         
+        Streams the file to disk CHUNK_SIZE bytes at a time, so at most
+        one chunk of it is held in memory. The bytes go to a hidden temp
+        file that is renamed into place once complete, so a crash or a
+        rejected upload never leaves a truncated file at a served URL.
+        
         Args:
-            file: File binary data
+            file: Binary file to read the data from
             filename: Original filename
             content_type: MIME type
             
         Returns:
             URL to access the uploaded file
+            
+        Raises:
+            ValueError: If the file exceeds MAX_FILE_SIZE
         """
+        await self._ensure_upload_dir()
+        
         # Generate unique filename to avoid collisions
         ext = Path(filename).suffix.lower()
         unique_filename = f"{uuid.uuid4()}{ext}"
         file_path = self.upload_dir / unique_filename
+        temp_path = self.upload_dir / f".tmp-{unique_filename}"
         
-        # Write file asynchronously
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Copy the whole file in one worker thread rather than hopping to
+        # a thread for every chunk read and every chunk write
+        await asyncio.to_thread(self._write_file, file, temp_path, file_path)
         
         # Return URL
         return f"{self.base_url}/uploads/photos/{unique_filename}"
     
+    def _write_file(self, file: BinaryIO, temp_path: Path, file_path: Path) -> None:
+        """Copy file to file_path via temp_path (blocking; runs in a worker thread)
+        
+        Reads into one preallocated buffer instead of a new bytes object
+        per chunk, checking the size as bytes arrive.
+        """
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        file_size = 0
+        try:
+            with open(temp_path, 'wb') as f:
+                while size := file.readinto(buffer):
+                    file_size += size
+                    self._validate_size(file_size)
+                    f.write(view[:size])
+        except BaseException:
+            # Don't leave a partial file behind
+            temp_path.unlink(missing_ok=True)
+            raise
+        
+        # Atomic within a filesystem: the URL serves nothing or all of it
+        os.replace(temp_path, file_path)
+    
     async def delete(self, file_url: str) -> None:
         """Delete file from local filesystem
         
         Args:
             file_url: URL of the file to delete
         """
-        # Extract filename from URL
+        # Extract filename from URL; ignore URLs this storage didn't issue
         # URL format: http://localhost:8000/uploads/photos/uuid.jpg
-        filename = Path(file_url).name
-        file_path = self.upload_dir / filename
+        match = _PHOTO_URL_RE.search(file_url)
+        if match is None:
+            return
+        file_path = self.upload_dir / match.group(1)
         
-        # Delete file if it exists
-        if file_path.exists():
-            file_path.unlink()
+        # Delete file if it exists (one syscall, no exists() race)
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(file_path)
+    
+    async def _ensure_upload_dir(self) -> None:
+        """Create the upload directory on first use, in a worker thread"""
+        if not self._upload_dir_ready:
+            await aiofiles.os.makedirs(self.upload_dir, exist_ok=True)
+            self._upload_dir_ready = True
     
     async def get_signed_url(self, file_url: str, expires_in: int = 3600) -> str:
         """Get URL for file access
@@ -1,13 +1,19 @@
 """Photo service implementation"""
 
+import asyncio
 import uuid
-from typing import BinaryIO
-from sqlalchemy import select
+from typing import BinaryIO, Optional
+from sqlalchemy import Integer, and_, column, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from db.models.profile import Photo, Profile
+from db.uuidv7 import uuid7
 from photo.storage_interface import StorageService
 from photo.exceptions import (
+    PhotoConflictError,
     PhotoNotFoundError,
     InvalidPhotoCountError,
     ProfileNotFoundError,
@@ -15,7 +21,14 @@ from photo.exceptions import (
 
 
 class PhotoService:
-    """Service for handling photo management"""
+    """Service for handling photo management
+    
+    Each write method runs its writes as one transaction (session.begin()),
+    committed on success and rolled back on any error, so it needs a
+    session with no transaction in progress, such as a fresh one from
+    get_db. upload_photo does its checks in a separate short transaction
+    so no connection is held while the file streams to storage.
+    """
     
     # Photo count constraints
     MIN_PHOTOS = 2
@@ -27,20 +40,20 @@ class PhotoService:
     
     async def upload_photo(
         self,
-        user_id: str,
+        user_id: uuid.UUID,
         file: BinaryIO,
         filename: str,
         content_type: str,
-        file_size: int
+        file_size: Optional[int] = None
     ) -> Photo:
         """Upload a photo for a user's profile
         
         Args:
             user_id: User ID
-            file: File binary data
+            file: Binary file to stream the data from
             filename: Original filename
             content_type: MIME type
-            file_size: File size in bytes
+            file_size: File size in bytes, if known before reading
             
         Returns:
             Photo object with URL
@@ -48,28 +61,32 @@ class PhotoService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
             InvalidPhotoCountError: If profile already has 6 photos
+            PhotoConflictError: If a concurrent upload took the same position
             ValueError: If file validation fails
         """
-        # Get profile
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
+        # Short read-only transaction: the connection goes back to the pool
+        # before the file is streamed to storage
+        async with self.db.begin():
+            # Get profile and its photo count in one round trip
+            result = await self.db.execute(
+                select(Profile.id, func.count(Photo.id).label("photo_count"))
+                .select_from(Profile)
+                .outerjoin(Photo, Photo.profile_id == Profile.id)
+                .where(Profile.user_id == user_id)
+                .group_by(Profile.id)
+            )
+            row = result.one_or_none()
         
-        if not profile:
+        if row is None:
             raise ProfileNotFoundError(f"Profile for user {user_id} not found")
         
-        # Check photo count
-        result = await self.db.execute(
-            select(Photo).where(Photo.profile_id == profile.id)
-        )
-        existing_photos = result.scalars().all()
+        profile_id, photo_count = row
         
-        if len(existing_photos) >= self.MAX_PHOTOS:
-            raise InvalidPhotoCountError(
-                f"Profile already has {self.MAX_PHOTOS} photos. "
-                f"Delete a photo before uploading a new one."
-            )
+        # Check photo count before storing anything. This is a fast
+        # path only: ck_photos_order / uq_photos_profile_order are what
+        # stop concurrent uploads from both getting past it.
+        if photo_count >= self.MAX_PHOTOS:
+            raise self._max_photos_error()
         
         # Validate file
         self.storage.validate_file(filename, content_type, file_size)
@@ -77,24 +94,41 @@ class PhotoService:
         # Upload to storage
         file_url = await self.storage.upload(file, filename, content_type)
         
-        # Determine order (next available position)
-        order = len(existing_photos)
-        
-        # Create photo record
-        photo = Photo(
-            id=str(uuid.uuid4()),
-            profile_id=profile.id,
-            url=file_url,
-            order=order,
+        # Next available position, read in the INSERT itself
+        next_order = (
+            select(func.coalesce(func.max(Photo.order) + 1, 0))
+            .where(Photo.profile_id == profile_id)
+            .scalar_subquery()
         )
         
-        self.db.add(photo)
-        await self.db.commit()
-        await self.db.refresh(photo)
+        # Create photo record. order and created_at are computed by
+        # the database, so RETURNING them saves reloading the row.
+        photo = Photo(id=uuid7(), profile_id=profile_id, url=file_url)
+        try:
+            async with self.db.begin():
+                try:
+                    result = await self.db.execute(
+                        insert(Photo)
+                        .values(id=photo.id, profile_id=photo.profile_id, url=photo.url, order=next_order)
+                        .returning(Photo.order, Photo.created_at)
+                    )
+                except IntegrityError as e:
+                    if "ck_photos_order" in str(e.orig):
+                        raise self._max_photos_error() from e
+                    raise PhotoConflictError(
+                        "Another photo was added to this profile at the same time. Try again."
+                    ) from e
+                photo.order, photo.created_at = result.one()
+        except BaseException:
+            # Nothing references the file unless the INSERT committed (this
+            # also covers a failed commit or a cancelled request). Shielded
+            # so a second cancellation can't interrupt the cleanup.
+            await asyncio.shield(self.storage.delete(file_url))
+            raise
         
         return photo
     
-    async def delete_photo(self, user_id: str, photo_id: str) -> None:
+    async def delete_photo(self, user_id: uuid.UUID, photo_id: uuid.UUID) -> None:
         """Delete a photo
         
         Args:
@@ -106,50 +140,49 @@ class PhotoService:
             PhotoNotFoundError: If photo doesn't exist
             InvalidPhotoCountError: If deleting would leave less than 2 photos
         """
-        # Get profile
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
-        
-        # Get photo
-        result = await self.db.execute(
-            select(Photo).where(
-                Photo.id == photo_id,
-                Photo.profile_id == profile.id
+        async with self.db.begin():
+            # Get profile, photo and the profile's photo count in one round
+            # trip. The outer join leaves photo NULL when it isn't this
+            # profile's, so the two not-found cases stay distinguishable.
+            sibling = aliased(Photo)
+            photo_count = (
+                select(func.count(sibling.id))
+                .where(sibling.profile_id == Profile.id)
+                .scalar_subquery()
             )
-        )
-        photo = result.scalar_one_or_none()
-        
-        if not photo:
-            raise PhotoNotFoundError(f"Photo {photo_id} not found")
-        
-        # Check photo count (must have at least MIN_PHOTOS)
-        result = await self.db.execute(
-            select(Photo).where(Photo.profile_id == profile.id)
-        )
-        existing_photos = result.scalars().all()
-        
-        if len(existing_photos) <= self.MIN_PHOTOS:
-            raise InvalidPhotoCountError(
-                f"Cannot delete photo. Profile must have at least {self.MIN_PHOTOS} photos."
+            result = await self.db.execute(
+                select(Profile.id, Photo, photo_count.label("photo_count"))
+                .select_from(Profile)
+                .outerjoin(Photo, and_(Photo.profile_id == Profile.id, Photo.id == photo_id))
+                .where(Profile.user_id == user_id)
             )
+            row = result.one_or_none()
+            
+            if row is None:
+                raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+            
+            profile_id, photo, photo_count = row
+            
+            if not photo:
+                raise PhotoNotFoundError(f"Photo {photo_id} not found")
+            
+            # Check photo count (must have at least MIN_PHOTOS)
+            if photo_count <= self.MIN_PHOTOS:
+                raise InvalidPhotoCountError(
+                    f"Cannot delete photo. Profile must have at least {self.MIN_PHOTOS} photos."
+                )
+            
+            # Delete from database
+            await self.db.delete(photo)
+            
+            # Reorder remaining photos
+            await self._reorder_photos_after_deletion(profile_id, photo.order)
         
-        # Delete from storage
+        # Delete from storage only once the row is gone, so a failed
+        # transaction never leaves a photo pointing at a missing file
         await self.storage.delete(photo.url)
-        
-        # Delete from database
-        await self.db.delete(photo)
-        
-        # Reorder remaining photos
-        await self._reorder_photos_after_deletion(profile.id, photo.order)
-        
-        await self.db.commit()
     
-    async def reorder_photos(self, user_id: str, photo_ids: list[str]) -> list[Photo]:
+    async def reorder_photos(self, user_id: uuid.UUID, photo_ids: list[uuid.UUID]) -> list[Photo]:
         """Reorder photos
         
         Args:
@@ -163,39 +196,53 @@ class PhotoService:
             ProfileNotFoundError: If profile doesn't exist
             ValueError: If photo_ids don't match existing photos
         """
-        # Get profile
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
-        
-        # Get all photos for profile
-        result = await self.db.execute(
-            select(Photo).where(Photo.profile_id == profile.id)
-        )
-        existing_photos = {photo.id: photo for photo in result.scalars().all()}
-        
-        # Validate photo_ids
-        if set(photo_ids) != set(existing_photos.keys()):
-            raise ValueError(
-                "photo_ids must match exactly with existing photos. "
-                f"Expected {len(existing_photos)} photos, got {len(photo_ids)}"
+        async with self.db.begin():
+            # Get profile and its photo IDs in one round trip
+            result = await self.db.execute(
+                select(
+                    Profile.id,
+                    func.array_agg(Photo.id).filter(Photo.id.is_not(None)),
+                )
+                .select_from(Profile)
+                .outerjoin(Photo, Photo.profile_id == Profile.id)
+                .where(Profile.user_id == user_id)
+                .group_by(Profile.id)
             )
-        
-        # Update order
-        for new_order, photo_id in enumerate(photo_ids):
-            photo = existing_photos[photo_id]
-            photo.order = new_order
-        
-        await self.db.commit()
+            row = result.one_or_none()
+            
+            if row is None:
+                raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+            
+            profile_id, existing_ids = row
+            existing_ids = existing_ids or []
+            
+            # Validate photo_ids: same IDs, each exactly once. With at most
+            # MAX_PHOTOS IDs, comparing sorted lists is cheaper than sets.
+            if sorted(photo_ids) != sorted(existing_ids):
+                raise ValueError(
+                    "photo_ids must match exactly with existing photos. "
+                    f"Expected {len(existing_ids)} photos, got {len(photo_ids)}"
+                )
+            
+            # Update order with a single UPDATE ... FROM (VALUES ...)
+            new_order = values(
+                column("id", UUID(as_uuid=True)),
+                column("order", Integer),
+                name="new_order",
+            ).data([(photo_id, order) for order, photo_id in enumerate(photo_ids)])
+            result = await self.db.scalars(
+                update(Photo)
+                .where(Photo.id == new_order.c.id, Photo.profile_id == profile_id)
+                .values(order=new_order.c.order)
+                .returning(Photo),
+                execution_options={"synchronize_session": False},
+            )
+            photos = {photo.id: photo for photo in result}
         
         # Return photos in new order
-        return [existing_photos[photo_id] for photo_id in photo_ids]
+        return [photos[photo_id] for photo_id in photo_ids]
     
-    async def get_photos(self, user_id: str) -> list[Photo]:
+    async def get_photos(self, user_id: uuid.UUID) -> list[Photo]:
         """Get all photos for a user's profile
         
         Args:
@@ -207,40 +254,48 @@ class PhotoService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
         """
-        # Get profile
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
+        # Get photos through the profile join, in one round trip
+        result = await self.db.scalars(
+            select(Photo)
+            .join(Profile, Profile.id == Photo.profile_id)
+            .where(Profile.user_id == user_id)
+            .order_by(Photo.order)
         )
-        profile = result.scalar_one_or_none()
+        photos = list(result)
         
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        if photos:
+            return photos
         
-        # Get photos
-        result = await self.db.execute(
-            select(Photo)
-            .where(Photo.profile_id == profile.id)
-            .order_by(Photo.order)
+        # No rows: tell a missing profile from one without photos
+        has_profile = await self.db.scalar(
+            select(select(Profile.id).where(Profile.user_id == user_id).exists())
         )
         
-        return list(result.scalars().all())
+        if not has_profile:
+            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        
+        return []
     
-    async def _reorder_photos_after_deletion(self, profile_id: str, deleted_order: int) -> None:
+    def _max_photos_error(self) -> InvalidPhotoCountError:
+        """Error for an upload to a profile that already has MAX_PHOTOS"""
+        return InvalidPhotoCountError(
+            f"Profile already has {self.MAX_PHOTOS} photos. "
+            f"Delete a photo before uploading a new one."
+        )
+    
+    async def _reorder_photos_after_deletion(self, profile_id: uuid.UUID, deleted_order: int) -> None:
         """Reorder photos after deletion to fill the gap
         
         Args:
             profile_id: Profile ID
             deleted_order: Order position of deleted photo
         """
-        # Get photos with order > deleted_order
-        result = await self.db.execute(
-            select(Photo)
+        # Decrement order for all photos after deleted one
+        await self.db.execute(
+            update(Photo)
             .where(
                 Photo.profile_id == profile_id,
                 Photo.order > deleted_order
             )
+            .values(order=Photo.order - 1)
         )
-        
-        # Decrement order for all photos after deleted one
-        for photo in result.scalars().all():
-            photo.order -= 1
@@ -9,7 +9,11 @@ Photo uploads use REST (not GraphQL) because:
 The PhotoService is API-agnostic and can be called from anywhere!
 """
 
+from functools import lru_cache
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from photo.photo_service import PhotoService
@@ -20,18 +24,31 @@ from photo.schemas import (
     PhotoReorderResponse,
 )
 from photo.exceptions import (
+    PhotoConflictError,
     PhotoNotFoundError,
     InvalidPhotoCountError,
     ProfileNotFoundError,
 )
 from photo.local_storage import LocalStorage
 from db.database import get_db
-from auth.dependencies import get_current_user
-from db.models.user import User
+from auth.dependencies import get_current_user_id
 
 
 router = APIRouter(prefix="/photos", tags=["photos"])
 
+# Validates a whole list of Photo rows in one call to the compiled validator
+_PHOTO_LIST_ADAPTER = TypeAdapter(list[PhotoResponse])
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> LocalStorage:
+    """Storage backend shared by every request in this process
+    
+    Built once, so BASE_URL is read and the upload directory created once
+    per process; cloud clients (S3, GCS) are worth reusing too.
+    """
+    return LocalStorage()
+
 
 def get_photo_service(db: AsyncSession = Depends(get_db)) -> PhotoService:
     """Dependency for getting photo service
@@ -41,16 +58,15 @@ def get_photo_service(db: AsyncSession = Depends(get_db)) -> PhotoService:
         
     Note:
         In production, swap LocalStorage for S3Storage, GCSStorage, etc.
-        by changing the storage parameter.
+        by changing what get_storage returns.
     """
-    storage = LocalStorage()
-    return PhotoService(db, storage)
+    return PhotoService(db, get_storage())
 
 
 @router.post("/upload", response_model=PhotoUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_photo(
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     photo_service: PhotoService = Depends(get_photo_service),
 ):
     """Upload a photo to user's profile
@@ -60,7 +76,7 @@ async def upload_photo(
     
     Args:
         file: Uploaded file (JPEG, PNG, or WebP, max 10MB)
-        current_user: Authenticated user
+        current_user_id: ID of the authenticated user
         photo_service: Photo service
         
     Returns:
@@ -69,22 +85,17 @@ async def upload_photo(
     Raises:
         HTTPException 404: If profile doesn't exist
         HTTPException 400: If file validation fails or max photos reached
+        HTTPException 409: If a concurrent upload took the same position
     """
     try:
-        # Get file info
-        content = await file.read()
-        file_size = len(content)
-        
-        # Reset file pointer for service to read
-        await file.seek(0)
-        
-        # Upload photo
+        # Upload photo, streaming it from the spooled upload. The size
+        # comes from the multipart parser, so nothing is read up front.
         photo = await photo_service.upload_photo(
-            user_id=current_user.id,
+            user_id=current_user_id,
             file=file.file,
             filename=file.filename,
             content_type=file.content_type,
-            file_size=file_size,
+            file_size=file.size,
         )
         
         return PhotoUploadResponse(
@@ -102,19 +113,24 @@ async def upload_photo(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except PhotoConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
 
 @router.delete("/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_photo(
-    photo_id: str,
-    current_user: User = Depends(get_current_user),
+    photo_id: UUID,
+    current_user_id: UUID = Depends(get_current_user_id),
     photo_service: PhotoService = Depends(get_photo_service),
 ):
     """Delete a photo from user's profile
     
     Args:
         photo_id: Photo ID to delete
-        current_user: Authenticated user
+        current_user_id: ID of the authenticated user
         photo_service: Photo service
         
     Raises:
@@ -122,7 +138,7 @@ async def delete_photo(
         HTTPException 400: If deleting would leave less than 2 photos
     """
     try:
-        await photo_service.delete_photo(current_user.id, photo_id)
+        await photo_service.delete_photo(current_user_id, photo_id)
         return None
         
     except ProfileNotFoundError as e:
@@ -145,14 +161,14 @@ async def delete_photo(
 @router.put("/reorder", response_model=PhotoReorderResponse)
 async def reorder_photos(
     request: PhotoReorderRequest,
-    current_user: User = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     photo_service: PhotoService = Depends(get_photo_service),
 ):
     """Reorder photos in user's profile
     
     Args:
         request: List of photo IDs in desired order
-        current_user: Authenticated user
+        current_user_id: ID of the authenticated user
         photo_service: Photo service
         
     Returns:
@@ -164,12 +180,12 @@ async def reorder_photos(
     """
     try:
         photos = await photo_service.reorder_photos(
-            current_user.id,
+            current_user_id,
             request.photo_ids
         )
         
         return PhotoReorderResponse(
-            photos=[PhotoResponse.model_validate(p) for p in photos],
+            photos=_PHOTO_LIST_ADAPTER.validate_python(photos, from_attributes=True),
             message="Photos reordered successfully"
         )
         
@@ -187,13 +203,13 @@ async def reorder_photos(
 
 @router.get("/", response_model=list[PhotoResponse])
 async def get_photos(
-    current_user: User = Depends(get_current_user),
+    current_user_id: UUID = Depends(get_current_user_id),
     photo_service: PhotoService = Depends(get_photo_service),
 ):
     """Get all photos for user's profile
     
     Args:
-        current_user: Authenticated user
+        current_user_id: ID of the authenticated user
         photo_service: Photo service
         
     Returns:
@@ -203,8 +219,8 @@ async def get_photos(
         HTTPException 404: If profile doesn't exist
     """
     try:
-        photos = await photo_service.get_photos(current_user.id)
-        return [PhotoResponse.model_validate(p) for p in photos]
+        photos = await photo_service.get_photos(current_user_id)
+        return _PHOTO_LIST_ADAPTER.validate_python(photos, from_attributes=True)
         
     except ProfileNotFoundError as e:
         raise HTTPException(
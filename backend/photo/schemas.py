@@ -1,13 +1,14 @@
 """Pydantic schemas for photo management"""
 
 from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel, Field
 
 
 class PhotoResponse(BaseModel):
     """Response schema for a photo"""
-    id: str
-    profile_id: str
+    id: UUID
+    profile_id: UUID
     url: str
     order: int
     created_at: datetime
@@ -24,7 +25,7 @@ class PhotoUploadResponse(BaseModel):
 
 class PhotoReorderRequest(BaseModel):
     """Request schema for reordering photos"""
-    photo_ids: list[str] = Field(..., min_length=2, max_length=6)
+    photo_ids: list[UUID] = Field(..., min_length=2, max_length=6)
 
 
 class PhotoReorderResponse(BaseModel):
@@ -6,7 +6,7 @@ without changing the application code.
 """
 
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import BinaryIO, Optional
 
 
 class StorageService(ABC):
@@ -23,13 +23,20 @@ class StorageService(ABC):
     async def upload(self, file: BinaryIO, filename: str, content_type: str) -> str:
         """Upload file to storage
         
+        Implementations read the file in chunks rather than all at once,
+        and enforce the size limit on the bytes actually received. Blocking
+        reads of file belong in a worker thread, not on the event loop.
+        
         Args:
-            file: File binary data
+            file: Binary file to read the data from (e.g. UploadFile.file)
             filename: Original filename
             content_type: MIME type (e.g., 'image/jpeg')
             
         Returns:
             URL to access the uploaded file
+            
+        Raises:
+            ValueError: If the file exceeds the size limit
         """
         pass
     
@@ -60,13 +67,18 @@ class StorageService(ABC):
         pass
     
     @abstractmethod
-    def validate_file(self, filename: str, content_type: str, file_size: int) -> None:
+    def validate_file(
+        self,
+        filename: str,
+        content_type: str,
+        file_size: Optional[int] = None
+    ) -> None:
         """Validate file before upload
         
         Args:
             filename: Original filename
             content_type: MIME type
-            file_size: File size in bytes
+            file_size: File size in bytes, if known before reading
             
         Raises:
             ValueError: If file is invalid (wrong type, too large, etc.)
@@ -1,18 +1,27 @@
 """Profile service implementation"""
 
+import asyncio
+import struct
 import uuid
 from typing import Optional
-from sqlalchemy import select, delete
+from redis.asyncio import Redis
+from sqlalchemy import delete, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from geoalchemy2.elements import WKTElement
+from sqlalchemy.orm import joinedload, raiseload
+from geoalchemy2.elements import WKBElement
+from geoalchemy2.shape import to_shape
 
+from app.config import settings
 from db.models.profile import Profile, Photo, Prompt, UserPreferences
+from db.uuidv7 import uuid7
 from profile.schemas import (
     ProfileInput,
     ProfileUpdate,
     ProfileResponse,
     PromptInput,
+    PromptResponse,
+    UserPreferencesResponse,
     Coordinates,
 )
 from profile.exceptions import (
@@ -21,14 +30,30 @@ from profile.exceptions import (
     InvalidPhotoCountError,
 )
 
+PROFILE_CACHE_PREFIX = "profile:"
+
+# EWKB for a WGS84 point: little-endian flag, geometry type Point with the
+# SRID bit set, SRID 4326, then the x/y doubles
+_EWKB_POINT_4326_HEADER = struct.pack("<BII", 1, 0x20000001, 4326)
+_EWKB_COORDS = struct.Struct("<dd")
+
 
 class ProfileService:
-    """Service for handling profile management"""
+    """Service for handling profile management
     
-    def __init__(self, db: AsyncSession):
+    With a Redis client, get_profile responses are cached under
+    `profile:<user_id>` for CACHE_TTL_PROFILE seconds, and every write
+    deletes the key once its transaction has committed. Responses are
+    also memoized on the instance, which lives for one request.
+    """
+    
+    def __init__(self, db: AsyncSession, redis_client: Optional[Redis] = None):
         self.db = db
+        self.redis = redis_client
+        self._responses: dict[uuid.UUID, ProfileResponse] = {}
+        self._inflight: dict[uuid.UUID, asyncio.Future[ProfileResponse]] = {}
     
-    async def create_profile(self, user_id: str, data: ProfileInput) -> ProfileResponse:
+    async def create_profile(self, user_id: uuid.UUID, data: ProfileInput) -> ProfileResponse:
         """Create a new profile for a user
         
         Args:
@@ -41,61 +66,80 @@ class ProfileService:
         Raises:
             ProfileAlreadyExistsError: If user already has a profile
         """
-        # Check if profile already exists
+        # Create profile in one atomic statement: the unique user_id
+        # constraint decides existence, so there is no SELECT round trip
+        # and no race between check and insert. RETURNING hands back the
+        # server-side timestamps. IDs are generated here (rather than by
+        # the column defaults) because the response needs them.
+        profile_id = uuid7()
         result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
+            insert(Profile)
+            .values(
+                id=profile_id,
+                user_id=user_id,
+                name=data.name,
+                age=data.age,
+                bio=data.bio,
+                location=self._coordinates_to_point(data.location) if data.location else None,
+            )
+            .on_conflict_do_nothing(index_elements=[Profile.user_id])
+            .returning(Profile.created_at, Profile.updated_at)
         )
-        existing_profile = result.scalar_one_or_none()
+        row = result.first()
         
-        if existing_profile:
+        if row is None:
+            await self.db.rollback()
             raise ProfileAlreadyExistsError(f"User {user_id} already has a profile")
         
-        # Create profile
-        profile = Profile(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            name=data.name,
-            age=data.age,
-            bio=data.bio,
-        )
-        
-        # Set location if provided
-        if data.location:
-            profile.location = self._coordinates_to_wkt(data.location)
-        
-        self.db.add(profile)
-        await self.db.flush()  # Flush to get profile.id for relationships
-        
-        # Create prompts
-        for prompt_data in data.prompts:
-            prompt = Prompt(
-                id=str(uuid.uuid4()),
-                profile_id=profile.id,
+        # Create prompts (one multi-row INSERT)
+        prompts = [
+            PromptResponse.model_construct(
+                id=uuid7(),
+                profile_id=profile_id,
                 question=prompt_data.question,
                 answer=prompt_data.answer,
                 order=prompt_data.order,
             )
-            self.db.add(prompt)
+            for prompt_data in data.prompts
+        ]
+        if prompts:
+            await self.db.execute(
+                insert(Prompt),
+                [prompt.model_dump() for prompt in prompts],
+            )
         
         # Create preferences
+        preferences = None
         if data.preferences:
-            preferences = UserPreferences(
-                id=str(uuid.uuid4()),
-                profile_id=profile.id,
-                min_age=data.preferences.min_age,
-                max_age=data.preferences.max_age,
-                max_distance=data.preferences.max_distance,
-                activity_level=data.preferences.activity_level,
-                distance_unit=data.preferences.distance_unit,
+            preferences = UserPreferencesResponse.model_construct(
+                id=uuid7(),
+                profile_id=profile_id,
+                **data.preferences.model_dump(),
+            )
+            await self.db.execute(
+                insert(UserPreferences).values(**preferences.model_dump())
             )
-            self.db.add(preferences)
         
         await self.db.commit()
         
-        # Reload profile with relationships
-        return await self.get_profile(user_id)
+        # Everything is known from the validated input and RETURNING; a
+        # new profile has no photos yet, so there is nothing to reload or
+        # re-validate
+        return ProfileResponse.model_construct(
+            id=profile_id,
+            user_id=user_id,
+            name=data.name,
+            age=data.age,
+            bio=data.bio,
+            location=data.location,
+            photos=[],
+            prompts=sorted(prompts, key=lambda prompt: prompt.order),
+            preferences=preferences,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
     
-    async def update_profile(self, user_id: str, data: ProfileUpdate) -> ProfileResponse:
+    async def update_profile(self, user_id: uuid.UUID, data: ProfileUpdate) -> ProfileResponse:
         """Update an existing profile
         
         Args:
@@ -108,19 +152,7 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
         """
-        # Get existing profile
-        result = await self.db.execute(
-            select(Profile)
-            .where(Profile.user_id == user_id)
-            .options(
-                selectinload(Profile.prompts),
-                selectinload(Profile.preferences)
-            )
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        profile = await self._load_profile(user_id)
         
         # Update basic fields
         if data.name is not None:
@@ -130,25 +162,11 @@ class ProfileService:
         if data.bio is not None:
             profile.bio = data.bio
         if data.location is not None:
-            profile.location = self._coordinates_to_wkt(data.location)
+            profile.location = self._coordinates_to_point(data.location)
         
         # Update prompts if provided
         if data.prompts is not None:
-            # Delete existing prompts
-            await self.db.execute(
-                delete(Prompt).where(Prompt.profile_id == profile.id)
-            )
-            
-            # Create new prompts
-            for prompt_data in data.prompts:
-                prompt = Prompt(
-                    id=str(uuid.uuid4()),
-                    profile_id=profile.id,
-                    question=prompt_data.question,
-                    answer=prompt_data.answer,
-                    order=prompt_data.order,
-                )
-                self.db.add(prompt)
+            self._sync_prompts(profile, data.prompts)
         
         # Update preferences if provided
         if data.preferences is not None:
@@ -160,9 +178,9 @@ class ProfileService:
                 profile.preferences.activity_level = data.preferences.activity_level
                 profile.preferences.distance_unit = data.preferences.distance_unit
             else:
-                # Create new preferences
-                preferences = UserPreferences(
-                    id=str(uuid.uuid4()),
+                # Create new preferences (through the relationship, so the
+                # response below sees them)
+                profile.preferences = UserPreferences(
                     profile_id=profile.id,
                     min_age=data.preferences.min_age,
                     max_age=data.preferences.max_age,
@@ -170,14 +188,15 @@ class ProfileService:
                     activity_level=data.preferences.activity_level,
                     distance_unit=data.preferences.distance_unit,
                 )
-                self.db.add(preferences)
         
         await self.db.commit()
+        await self._invalidate_cache(user_id)
         
-        # Reload profile with relationships
-        return await self.get_profile(user_id)
+        # Everything written is already on the loaded profile, and
+        # updated_at comes back from the UPDATE's RETURNING
+        return self._profile_to_response(profile)
     
-    async def get_profile(self, user_id: str) -> ProfileResponse:
+    async def get_profile(self, user_id: uuid.UUID) -> ProfileResponse:
         """Get profile by user ID
         
         Args:
@@ -189,23 +208,23 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
         """
-        result = await self.db.execute(
-            select(Profile)
-            .where(Profile.user_id == user_id)
-            .options(
-                selectinload(Profile.photos),
-                selectinload(Profile.prompts),
-                selectinload(Profile.preferences)
-            )
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
-        
-        return self._profile_to_response(profile)
+        response = self._responses.get(user_id)
+        if response is not None:
+            return response
+        
+        # Concurrent callers share one lookup; the session can't run two
+        # queries at once anyway
+        lookup = self._inflight.get(user_id)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._fetch_profile(user_id))
+            self._inflight[user_id] = lookup
+            lookup.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        
+        response = await lookup
+        self._responses[user_id] = response
+        return response
     
-    async def delete_profile(self, user_id: str) -> None:
+    async def delete_profile(self, user_id: uuid.UUID) -> None:
         """Delete profile and all associated data (cascade deletion)
         
         Args:
@@ -214,19 +233,21 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
         """
+        # One DELETE: ON DELETE CASCADE on the photos, prompts and
+        # user_preferences foreign keys removes the children server-side
         result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
+            delete(Profile)
+            .where(Profile.user_id == user_id)
+            .returning(Profile.id)
         )
-        profile = result.scalar_one_or_none()
         
-        if not profile:
+        if result.first() is None:
             raise ProfileNotFoundError(f"Profile for user {user_id} not found")
         
-        # Delete profile (cascade will handle photos, prompts, preferences)
-        await self.db.delete(profile)
         await self.db.commit()
+        await self._invalidate_cache(user_id)
     
-    async def add_prompt(self, user_id: str, prompt_data: PromptInput) -> ProfileResponse:
+    async def add_prompt(self, user_id: uuid.UUID, prompt_data: PromptInput) -> ProfileResponse:
         """Add a prompt to a profile
         
         Args:
@@ -239,29 +260,26 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile doesn't exist
         """
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        profile = await self._load_profile(user_id)
         
         # Create new prompt
         prompt = Prompt(
-            id=str(uuid.uuid4()),
             profile_id=profile.id,
             question=prompt_data.question,
             answer=prompt_data.answer,
             order=prompt_data.order,
         )
-        self.db.add(prompt)
+        profile.prompts.append(prompt)
         await self.db.commit()
+        await self._invalidate_cache(user_id)
+        
+        # Keep the relationship's ORDER BY without reloading
+        profile.prompts.sort(key=lambda p: p.order)
         
-        return await self.get_profile(user_id)
+        return self._profile_to_response(profile)
     
     async def update_prompt(
-        self, user_id: str, prompt_id: str, prompt_data: PromptInput
+        self, user_id: uuid.UUID, prompt_id: uuid.UUID, prompt_data: PromptInput
     ) -> ProfileResponse:
         """Update a prompt
         
@@ -276,26 +294,9 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile or prompt doesn't exist
         """
-        # Get profile to verify ownership
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
-        
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
-        
-        # Get prompt
-        result = await self.db.execute(
-            select(Prompt).where(
-                Prompt.id == prompt_id,
-                Prompt.profile_id == profile.id
-            )
-        )
-        prompt = result.scalar_one_or_none()
-        
-        if not prompt:
-            raise ProfileNotFoundError(f"Prompt {prompt_id} not found")
+        # The loaded profile's prompts double as the ownership check
+        profile = await self._load_profile(user_id)
+        prompt = self._find_prompt(profile, prompt_id)
         
         # Update prompt
         prompt.question = prompt_data.question
@@ -303,10 +304,14 @@ class ProfileService:
         prompt.order = prompt_data.order
         
         await self.db.commit()
+        await self._invalidate_cache(user_id)
+        
+        # Keep the relationship's ORDER BY without reloading
+        profile.prompts.sort(key=lambda p: p.order)
         
-        return await self.get_profile(user_id)
+        return self._profile_to_response(profile)
     
-    async def delete_prompt(self, user_id: str, prompt_id: str) -> ProfileResponse:
+    async def delete_prompt(self, user_id: uuid.UUID, prompt_id: uuid.UUID) -> ProfileResponse:
         """Delete a prompt
         
         Args:
@@ -319,87 +324,184 @@ class ProfileService:
         Raises:
             ProfileNotFoundError: If profile or prompt doesn't exist
         """
-        # Get profile to verify ownership
-        result = await self.db.execute(
-            select(Profile).where(Profile.user_id == user_id)
-        )
-        profile = result.scalar_one_or_none()
+        # The loaded profile's prompts double as the ownership check
+        profile = await self._load_profile(user_id)
+        prompt = self._find_prompt(profile, prompt_id)
         
-        if not profile:
-            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        # Delete prompt (delete-orphan cascade issues the DELETE)
+        profile.prompts.remove(prompt)
+        await self.db.commit()
+        await self._invalidate_cache(user_id)
         
-        # Get prompt
-        result = await self.db.execute(
-            select(Prompt).where(
-                Prompt.id == prompt_id,
-                Prompt.profile_id == profile.id
-            )
-        )
-        prompt = result.scalar_one_or_none()
+        return self._profile_to_response(profile)
+    
+    def _sync_prompts(self, profile: Profile, prompts: list[PromptInput]) -> None:
+        """Make a loaded profile's prompts match prompts, touching only what changed
         
-        if not prompt:
-            raise ProfileNotFoundError(f"Prompt {prompt_id} not found")
+        Prompts have no ID in the input, so they are matched to existing
+        ones by position (order). Matched prompts are updated in place (the
+        flush skips any whose question and answer are unchanged), new
+        positions are inserted, and leftover prompts are deleted through
+        the delete-orphan cascade. The flush batches each kind of write.
         
-        # Delete prompt
-        await self.db.delete(prompt)
-        await self.db.commit()
+        Args:
+            profile: Profile with prompts loaded
+            prompts: Complete new list of prompts
+        """
+        existing_by_order: dict[int, list[Prompt]] = {}
+        for prompt in profile.prompts:
+            existing_by_order.setdefault(prompt.order, []).append(prompt)
+        
+        for prompt_data in prompts:
+            matches = existing_by_order.get(prompt_data.order)
+            if matches:
+                prompt = matches.pop()
+                prompt.question = prompt_data.question
+                prompt.answer = prompt_data.answer
+            else:
+                profile.prompts.append(
+                    Prompt(
+                        profile_id=profile.id,
+                        question=prompt_data.question,
+                        answer=prompt_data.answer,
+                        order=prompt_data.order,
+                    )
+                )
+        
+        for leftovers in existing_by_order.values():
+            for prompt in leftovers:
+                profile.prompts.remove(prompt)
         
-        return await self.get_profile(user_id)
+        # Keep the relationship's ORDER BY without reloading
+        profile.prompts.sort(key=lambda p: p.order)
     
-    def _coordinates_to_wkt(self, coords: Coordinates) -> WKTElement:
-        """Convert Coordinates to PostGIS WKT format
+    async def _fetch_profile(self, user_id: uuid.UUID) -> ProfileResponse:
+        """Get a profile from Redis, falling back to the database
+        
+        Raises:
+            ProfileNotFoundError: If profile doesn't exist
+        """
+        if self.redis is not None:
+            cached = await self.redis.get(self._cache_key(user_id))
+            if cached is not None:
+                return ProfileResponse.model_validate_json(cached)
+        
+        profile = await self._load_profile(user_id)
+        response = self._profile_to_response(profile)
+        
+        if self.redis is not None:
+            await self.redis.set(
+                self._cache_key(user_id),
+                response.model_dump_json(),
+                ex=settings.CACHE_TTL_PROFILE,
+            )
+        return response
+    
+    def _cache_key(self, user_id: uuid.UUID) -> str:
+        """Redis key for a user's cached ProfileResponse"""
+        return f"{PROFILE_CACHE_PREFIX}{user_id}"
+    
+    async def _invalidate_cache(self, user_id: uuid.UUID) -> None:
+        """Drop the cached response so the next get_profile reloads it"""
+        self._responses.pop(user_id, None)
+        if self.redis is not None:
+            await self.redis.delete(self._cache_key(user_id))
+    
+    async def _load_profile(self, user_id: uuid.UUID) -> Profile:
+        """Load a user's profile with everything ProfileResponse reads
         
         Args:
-            coords: Coordinates object
+            user_id: User ID
             
         Returns:
-            WKTElement for PostGIS
+            Profile with prompts and preferences loaded
+            
+        Raises:
+            ProfileNotFoundError: If profile doesn't exist
         """
-        return WKTElement(
-            f'POINT({coords.longitude} {coords.latitude})',
-            srid=4326
+        # Lambda statements cache their construction and compiled SQL by
+        # code location, so each load only binds user_id
+        stmt = lambda_stmt(
+            lambda: select(Profile).options(
+                # Only what ProfileResponse reads (photos come from the photo
+                # service), joined so the profile, its few prompts and its
+                # preferences arrive in one round trip; any other lazy load
+                # raises instead of issuing a query
+                joinedload(Profile.prompts),
+                joinedload(Profile.preferences),
+                raiseload("*"),
+            )
         )
+        stmt += lambda s: s.where(Profile.user_id == user_id)
+        result = await self.db.execute(stmt)
+        # The prompts join repeats the profile row once per prompt
+        profile = result.unique().scalar_one_or_none()
+        
+        if not profile:
+            raise ProfileNotFoundError(f"Profile for user {user_id} not found")
+        
+        return profile
     
-    def _wkt_to_coordinates(self, wkt: str) -> Optional[Coordinates]:
-        """Convert PostGIS WKT to Coordinates
+    def _find_prompt(self, profile: Profile, prompt_id: uuid.UUID) -> Prompt:
+        """Find one of a loaded profile's prompts by ID
+        
+        Raises:
+            ProfileNotFoundError: If the profile has no such prompt
+        """
+        for prompt in profile.prompts:
+            if prompt.id == prompt_id:
+                return prompt
+        raise ProfileNotFoundError(f"Prompt {prompt_id} not found")
+    
+    def _coordinates_to_point(self, coords: Coordinates) -> WKBElement:
+        """Convert Coordinates to a PostGIS point
         
         Args:
-            wkt: WKT string from database
+            coords: Coordinates object
             
         Returns:
-            Coordinates object or None
+            WKBElement, sent to PostGIS as EWKB (no WKT to format or parse)
         """
-        if not wkt:
-            return None
-        
-        # Parse WKT format: "POINT(longitude latitude)"
-        # Note: PostGIS stores as (lon, lat) but we return as (lat, lon)
-        try:
-            # Remove "POINT(" and ")"
-            coords_str = wkt.replace('POINT(', '').replace(')', '')
-            lon, lat = map(float, coords_str.split())
-            return Coordinates(latitude=lat, longitude=lon)
-        except (ValueError, AttributeError):
-            return None
+        # PostGIS points are (longitude, latitude); only the coordinates
+        # vary, so append them to the constant header
+        return WKBElement(
+            _EWKB_POINT_4326_HEADER + _EWKB_COORDS.pack(coords.longitude, coords.latitude),
+            srid=4326,
+            extended=True,
+        )
     
     def _profile_to_response(self, profile: Profile) -> ProfileResponse:
         """Convert Profile model to ProfileResponse
         
+        Rows from the database are trusted, so the response is built
+        with model_construct and skips validation.
+        
         Args:
             profile: Profile model instance
             
         Returns:
             ProfileResponse
         """
-        # Convert location from WKT to Coordinates
+        # Convert location from EWKB to Coordinates
         location = None
         if profile.location:
-            # Use geoalchemy2 to get WKT string
-            from geoalchemy2.shape import to_shape
             point = to_shape(profile.location)
-            location = Coordinates(latitude=point.y, longitude=point.x)
+            location = Coordinates.model_construct(latitude=point.y, longitude=point.x)
+        
+        preferences = None
+        if profile.preferences:
+            prefs = profile.preferences
+            preferences = UserPreferencesResponse.model_construct(
+                id=prefs.id,
+                profile_id=prefs.profile_id,
+                min_age=prefs.min_age,
+                max_age=prefs.max_age,
+                max_distance=prefs.max_distance,
+                activity_level=prefs.activity_level,
+                distance_unit=prefs.distance_unit,
+            )
         
-        return ProfileResponse(
+        return ProfileResponse.model_construct(
             id=profile.id,
             user_id=profile.user_id,
             name=profile.name,
@@ -407,8 +509,17 @@ class ProfileService:
             bio=profile.bio,
             location=location,
             photos=[],  # Photos will be populated by photo service
-            prompts=[p for p in profile.prompts] if profile.prompts else [],
-            preferences=profile.preferences if profile.preferences else None,
+            prompts=[
+                PromptResponse.model_construct(
+                    id=p.id,
+                    profile_id=p.profile_id,
+                    question=p.question,
+                    answer=p.answer,
+                    order=p.order,
+                )
+                for p in profile.prompts
+            ],
+            preferences=preferences,
             created_at=profile.created_at,
             updated_at=profile.updated_at,
         )
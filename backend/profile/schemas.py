@@ -2,7 +2,8 @@
 
 from datetime import datetime
 from typing import Optional, Literal
-from pydantic import BaseModel, Field, field_validator
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 ActivityLevel = Literal['low', 'medium', 'high']
@@ -11,12 +12,16 @@ DistanceUnit = Literal['miles', 'kilometers']
 
 class Coordinates(BaseModel):
     """Geographic coordinates"""
+    model_config = ConfigDict(frozen=True)
+    
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
 
 
 class PromptInput(BaseModel):
     """Input schema for creating/updating a prompt"""
+    model_config = ConfigDict(frozen=True)
+    
     question: str = Field(..., min_length=1, max_length=500)
     answer: str = Field(..., min_length=1, max_length=1000)
     order: int = Field(..., ge=0)
@@ -24,61 +29,61 @@ class PromptInput(BaseModel):
 
 class PromptResponse(BaseModel):
     """Response schema for a prompt"""
-    id: str
-    profile_id: str
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: UUID
+    profile_id: UUID
     question: str
     answer: str
     order: int
-    
-    class Config:
-        from_attributes = True
 
 
 class PhotoResponse(BaseModel):
     """Response schema for a photo"""
-    id: str
-    profile_id: str
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: UUID
+    profile_id: UUID
     url: str
     order: int
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
 class UserPreferencesInput(BaseModel):
     """Input schema for user preferences"""
+    model_config = ConfigDict(frozen=True)
+    
     min_age: int = Field(default=0, ge=0, le=20)
     max_age: int = Field(default=20, ge=0, le=20)
     max_distance: float = Field(default=25.0, gt=0)
     activity_level: ActivityLevel = Field(default='medium')
     distance_unit: DistanceUnit = Field(default='miles')
     
-    @field_validator('max_age')
-    @classmethod
-    def validate_age_range(cls, v: int, info) -> int:
+    @model_validator(mode='after')
+    def validate_age_range(self) -> 'UserPreferencesInput':
         """Ensure max_age >= min_age"""
-        if 'min_age' in info.data and v < info.data['min_age']:
+        if self.max_age < self.min_age:
             raise ValueError('max_age must be greater than or equal to min_age')
-        return v
+        return self
 
 
 class UserPreferencesResponse(BaseModel):
     """Response schema for user preferences"""
-    id: str
-    profile_id: str
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: UUID
+    profile_id: UUID
     min_age: int
     max_age: int
     max_distance: float
     activity_level: ActivityLevel
     distance_unit: DistanceUnit
-    
-    class Config:
-        from_attributes = True
 
 
 class ProfileInput(BaseModel):
     """Input schema for creating a profile"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., min_length=1, max_length=100)
     age: int = Field(..., ge=0, le=20)
     bio: str = Field(..., min_length=1, max_length=2000)
@@ -89,6 +94,8 @@ class ProfileInput(BaseModel):
 
 class ProfileUpdate(BaseModel):
     """Input schema for updating a profile"""
+    model_config = ConfigDict(frozen=True)
+    
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     age: Optional[int] = Field(None, ge=0, le=20)
     bio: Optional[str] = Field(None, min_length=1, max_length=2000)
@@ -99,8 +106,10 @@ class ProfileUpdate(BaseModel):
 
 class ProfileResponse(BaseModel):
     """Response schema for a profile with nested photos and prompts"""
-    id: str
-    user_id: str
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: UUID
+    user_id: UUID
     name: str
     age: int
     bio: str
@@ -110,6 +119,3 @@ class ProfileResponse(BaseModel):
     preferences: Optional[UserPreferencesResponse] = None
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
@@ -1,19 +1,29 @@
 """Pytest configuration and fixtures"""
 
+from contextlib import contextmanager
+
 import pytest
 import pytest_asyncio
+import redis.asyncio as redis
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.main import app
 from db.database import Base, get_db
+from db.engine import create_db_engine
 from app.config import settings
 
 # Test database URL
 TEST_DATABASE_URL = settings.DATABASE_URL.replace("/pupmatch", "/pupmatch_test")
 
-# Create test engine
-test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+# Same factory and pool settings as the app engine, so tests reuse warm
+# connections and exercise the production pool configuration. This used
+# to be a NullPool engine because each test ran in its own event loop and
+# a pooled asyncpg connection can't move between loops; every test and
+# async fixture now shares the session loop (see pytest_collection_modifyitems
+# and asyncio_default_fixture_loop_scope in pyproject.toml).
+test_engine = create_db_engine(TEST_DATABASE_URL, echo=False)
 TestSessionLocal = async_sessionmaker(
     test_engine,
     class_=AsyncSession,
@@ -21,6 +31,52 @@ TestSessionLocal = async_sessionmaker(
 )
 
 
+@contextmanager
+def count_queries():
+    """Count the statements executed on the test engine inside the block"""
+    statements: list[str] = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session event loop
+    
+    Pooled connections are bound to the loop that opened them; sharing
+    the loop lets them be reused from one test to the next.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def dispose_test_engine():
+    """Close the test engine's pooled connections after the last test"""
+    yield
+    await test_engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def redis_client():
+    """One Redis client (and connection pool) shared by every test
+    
+    No FLUSHDB between tests: REDIS_URL is also the Celery broker
+    database, so each test deletes the keys it writes instead.
+    """
+    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    yield client
+    await client.close()
+
+
 @pytest_asyncio.fixture
 async def db_session():
     """Create a test database session"""
@@ -0,0 +1,98 @@
+"""Tests for the authentication routes and token dependencies"""
+
+import time
+import uuid
+
+import jwt
+import pytest
+
+from app.config import settings
+from tests.conftest import count_queries
+
+
+async def register_and_login(client, email):
+    """Register a user through the API and return (user, access token)"""
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": "password123"}
+    )
+    assert response.status_code == 201
+    user = response.json()
+    
+    response = await client.post(
+        "/auth/login", json={"email": email, "password": "password123"}
+    )
+    assert response.status_code == 200
+    return user, response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_me_served_from_token_claims(client):
+    """Test that /auth/me answers from the token claims without a database query"""
+    user, token = await register_and_login(client, "me@example.com")
+    
+    with count_queries() as statements:
+        response = await client.get(
+            "/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+    
+    assert response.status_code == 200
+    assert response.json() == user
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_me_falls_back_to_database_for_legacy_tokens(client):
+    """Test that /auth/me loads the user when the token has no email claim"""
+    response = await client.post(
+        "/auth/register", json={"email": "legacy@example.com", "password": "password123"}
+    )
+    user = response.json()
+    
+    # Token shaped like those issued before the user fields were added
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": user["id"], "exp": now + 60, "iat": now},
+        settings.SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    
+    with count_queries() as statements:
+        response = await client.get(
+            "/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+    
+    assert response.status_code == 200
+    assert response.json() == user
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(client):
+    """Test that a token is rejected after logging out with it"""
+    _, token = await register_and_login(client, "logout@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = await client.post("/auth/logout", headers=headers)
+    assert response.status_code == 204
+    
+    response = await client.get("/auth/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+    
+    response = await client.post("/auth/logout", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Basic dXNlcjpwYXNz"},
+    {"Authorization": "Bearer"},
+    {"Authorization": f"Token {uuid.uuid4().hex}"},
+])
+async def test_missing_or_non_bearer_header_is_unauthorized(client, headers):
+    """Test that requests without a Bearer token get 401 with a Bearer challenge"""
+    response = await client.get("/auth/me", headers=headers)
+    
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
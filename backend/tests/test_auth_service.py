@@ -0,0 +1,184 @@
+"""Tests for the authentication service"""
+
+import asyncio
+import time
+import uuid
+
+import bcrypt
+import jwt
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+import auth.auth_service as auth_service
+from auth.auth_service import AuthService, decode_access_token, invalidate_cached_user
+from auth.exceptions import InvalidCredentialsError, InvalidTokenError, UserAlreadyExistsError
+from db.models.user import User
+from tests.conftest import TestSessionLocal
+
+
+def make_token(lifetime=60):
+    """Sign an access token for a random user that expires after lifetime seconds"""
+    now = int(time.time())
+    return jwt.encode(
+        {"sub": str(uuid.uuid4()), "exp": now + lifetime, "iat": now},
+        settings.SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+
+
+async def add_user(session, email, password_hash):
+    """Insert a user with a given stored hash, bypassing register"""
+    session.add(User(email=email, password_hash=password_hash))
+    await session.commit()
+
+
+async def stored_hash(session, email):
+    """Read a user's current password hash straight from the database"""
+    result = await session.execute(select(User.password_hash).where(User.email == email))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email(db_session):
+    """Test that registering an existing email raises UserAlreadyExistsError"""
+    service = AuthService(db_session)
+    await service.register("dup@example.com", "password123")
+    
+    with pytest.raises(UserAlreadyExistsError):
+        await service.register("dup@example.com", "password123")
+
+
+@pytest.mark.asyncio
+async def test_register_case_variant_email(db_session):
+    """Test that an email differing only by case counts as already registered"""
+    service = AuthService(db_session)
+    user = await service.register("Case@Example.com", "password123")
+    assert user.email == "case@example.com"
+    
+    with pytest.raises(UserAlreadyExistsError):
+        await service.register("CASE@example.COM", "password123")
+
+
+@pytest.mark.asyncio
+async def test_register_concurrent_same_email(db_session):
+    """Test that simultaneous registrations of one email yield one user and one conflict"""
+    async def register(email):
+        async with TestSessionLocal() as session:
+            return await AuthService(session).register(email, "password123")
+    
+    results = await asyncio.gather(
+        register("race@example.com"),
+        register("Race@example.com"),
+        return_exceptions=True,
+    )
+    
+    assert sum(isinstance(r, UserAlreadyExistsError) for r in results) == 1
+    assert sum(not isinstance(r, BaseException) for r in results) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_cache_survives_loading_session(db_session):
+    """Test that a cached user stays usable after the session that loaded it rolls back or edits it"""
+    registered = await AuthService(db_session).register("cached@example.com", "password123")
+    invalidate_cached_user(registered.id)
+    
+    async with TestSessionLocal() as first, TestSessionLocal() as second:
+        # First request loads (and caches) the user, edits it, then rolls back
+        user = await AuthService(first).get_user(registered.id)
+        user.email = "edited@example.com"
+        await first.rollback()
+        
+        # Second request is served from the cache with the committed values
+        cached = await AuthService(second).get_user(registered.id)
+        assert cached is not user
+        assert cached.email == "cached@example.com"
+        assert cached.created_at == registered.created_at
+        assert not second.new and not second.dirty
+    
+    invalidate_cached_user(registered.id)
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_bcrypt_hash(db_session):
+    """Test that a legacy bcrypt hash still logs in and is rewritten as Argon2id"""
+    legacy_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode()
+    await add_user(db_session, "legacy@example.com", legacy_hash)
+    
+    token = await AuthService(db_session).login("legacy@example.com", "password123")
+    assert token.access_token
+    
+    new_hash = await stored_hash(db_session, "legacy@example.com")
+    assert new_hash.startswith("$argon2id$")
+    
+    # The upgraded hash verifies the same password
+    await AuthService(db_session).login("legacy@example.com", "password123")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("hash_type", ["bcrypt", "argon2id"])
+async def test_login_wrong_password(db_session, hash_type):
+    """Test that a wrong password fails for both hash types and leaves the hash alone"""
+    email = f"{hash_type}@example.com"
+    if hash_type == "bcrypt":
+        password_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode()
+    else:
+        password_hash = await AuthService(db_session)._hash_password("password123")
+    await add_user(db_session, email, password_hash)
+    
+    with pytest.raises(InvalidCredentialsError):
+        await AuthService(db_session).login(email, "wrong-password")
+    
+    assert await stored_hash(db_session, email) == password_hash
+
+
+@pytest.mark.asyncio
+async def test_login_unknown_email_runs_kdf(db_session, monkeypatch):
+    """Test that an unknown email is still checked against the dummy hash"""
+    checked = []
+    check_password = auth_service._check_password
+    
+    def recording_check(password, password_hash):
+        checked.append(password_hash)
+        return check_password(password, password_hash)
+    
+    monkeypatch.setattr(auth_service, "_check_password", recording_check)
+    
+    with pytest.raises(InvalidCredentialsError):
+        await AuthService(db_session).login("nobody@example.com", "password123")
+    
+    assert checked == [auth_service._DUMMY_PASSWORD_HASH]
+
+
+def test_cached_token_rejected_after_expiry(monkeypatch):
+    """Test that a cache hit still checks exp"""
+    token = make_token(lifetime=5)
+    assert decode_access_token(token) is decode_access_token(token)
+    
+    expired_at = time.time() + 10
+    monkeypatch.setattr(time, "time", lambda: expired_at)
+    
+    with pytest.raises(InvalidTokenError, match="expired"):
+        decode_access_token(token)
+
+
+def test_tampered_token_not_served_from_cache():
+    """Test that altering a cached token fails verification instead of hitting the cache"""
+    token = make_token()
+    claims = decode_access_token(token)
+    
+    header, payload, signature = token.split(".")
+    forged_payload = jwt.utils.base64url_encode(
+        f'{{"sub": "{uuid.uuid4()}", "exp": {claims["exp"]}}}'.encode()
+    ).decode()
+    
+    forged_signature = ("A" if signature[0] != "A" else "B") + signature[1:]
+    
+    for tampered in (
+        f"{header}.{forged_payload}.{signature}",
+        f"{header}.{payload}.{forged_signature}",
+    ):
+        with pytest.raises(InvalidTokenError):
+            decode_access_token(tampered)
+    
+    assert decode_access_token(token) == claims
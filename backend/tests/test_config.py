@@ -1,7 +1,9 @@
 """Tests for configuration loading"""
 
 import pytest
-from app.config import settings
+from pydantic import ValidationError
+
+from app.config import get_settings, settings
 
 
 def test_environment_variable_loading():
@@ -11,12 +13,22 @@ def test_environment_variable_loading():
     assert settings.ACCESS_TOKEN_EXPIRE_MINUTES == 1440
 
 
+def test_settings_are_cached_and_frozen():
+    """Test that settings are built once and cannot be mutated"""
+    assert get_settings() is settings
+    
+    with pytest.raises(ValidationError):
+        settings.DEBUG = not settings.DEBUG
+
+
 def test_database_configuration():
     """Test database configuration is set"""
     assert settings.DATABASE_URL is not None
     assert "postgresql" in settings.DATABASE_URL
     assert settings.DATABASE_POOL_SIZE > 0
     assert settings.DATABASE_MAX_OVERFLOW > 0
+    assert settings.DATABASE_STATEMENT_CACHE_SIZE >= 0
+    assert settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE >= 0
 
 
 def test_redis_configuration():
@@ -34,6 +46,12 @@ def test_security_configuration():
     assert len(settings.ALLOWED_ORIGINS) > 0
 
 
+def test_allowed_origins_set_matches_list():
+    """Test the CORS origin set mirrors ALLOWED_ORIGINS"""
+    assert isinstance(settings.allowed_origins_set, frozenset)
+    assert settings.allowed_origins_set == set(settings.ALLOWED_ORIGINS)
+
+
 def test_rate_limiting_configuration():
     """Test rate limiting settings"""
     assert settings.RATE_LIMIT_PER_USER > 0
@@ -52,3 +70,4 @@ def test_cache_ttl_configuration():
     assert settings.CACHE_TTL_PROFILE > 0
     assert settings.CACHE_TTL_RECOMMENDATIONS > 0
     assert settings.CACHE_TTL_SESSION > 0
+    assert settings.CACHE_TTL_UNREAD_COUNT > 0
@@ -0,0 +1,21 @@
+"""Tests for the database engine pool configuration"""
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from db.database import engine
+from db.engine import get_engine
+
+
+def test_engine_uses_async_queue_pool():
+    """Test that the async engine pools connections with the asyncio-aware queue pool"""
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    assert engine.pool.size() == settings.DATABASE_POOL_SIZE
+    assert engine.pool._pre_ping is True
+    assert engine.pool._recycle == settings.DATABASE_POOL_RECYCLE
+
+
+def test_engine_is_shared_process_wide():
+    """Test that the app and scripts get the same lazily created engine"""
+    assert get_engine() is get_engine()
+    assert get_engine() is engine
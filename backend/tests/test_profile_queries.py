@@ -0,0 +1,104 @@
+"""Tests for the queries issued by the profile service"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import configure_mappers
+
+from db.models.user import User
+from profile.profile_service import ProfileService
+from profile.schemas import ProfileInput, ProfileUpdate, PromptInput, UserPreferencesInput
+from tests.conftest import count_queries
+
+
+def test_profile_mappers_configure():
+    """Test that every relationship on the profile models has a resolvable join
+    
+    Runs without a database, so a broken mapping fails here instead of
+    erroring out every test that touches the models.
+    """
+    configure_mappers()
+
+
+@pytest.fixture
+async def user(db_session):
+    """A user with a profile, two prompts and preferences"""
+    user = User(email="queries@example.com", password_hash="x")
+    db_session.add(user)
+    await db_session.commit()
+    
+    await ProfileService(db_session).create_profile(
+        user.id,
+        ProfileInput(
+            name="Rex",
+            age=3,
+            bio="Good boy",
+            prompts=[
+                PromptInput(question="Favorite toy?", answer="Ball", order=0),
+                PromptInput(question="Best trick?", answer="Sit", order=1),
+            ],
+            preferences=UserPreferencesInput(),
+        ),
+    )
+    db_session.expunge_all()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_get_profile_query_count(db_session, user):
+    """Test that get_profile loads the profile and its relationships in a fixed number of queries"""
+    service = ProfileService(db_session)
+    
+    with count_queries() as statements:
+        response = await service.get_profile(user.id)
+    
+    # Prompts and preferences are joined into the profile query
+    assert len(statements) == 1
+    assert [p.order for p in response.prompts] == [0, 1]
+    assert response.preferences is not None
+
+
+@pytest.mark.asyncio
+async def test_get_profile_memoized_per_service(db_session, user):
+    """Test that repeated and concurrent get_profile calls share one lookup"""
+    service = ProfileService(db_session)
+    
+    with count_queries() as statements:
+        first, second = await asyncio.gather(
+            service.get_profile(user.id),
+            service.get_profile(user.id),
+        )
+        third = await service.get_profile(user.id)
+    
+    assert len(statements) == 1
+    assert first is second is third
+
+
+@pytest.mark.asyncio
+async def test_loaded_profile_raises_on_lazy_load(db_session, user):
+    """Test that relationships not loaded explicitly raise instead of lazy loading"""
+    profile = await ProfileService(db_session)._load_profile(user.id)
+    
+    with pytest.raises(InvalidRequestError):
+        profile.photos
+
+
+@pytest.mark.asyncio
+async def test_get_profile_served_from_cache(db_session, redis_client, user):
+    """Test that a cached profile is returned without querying, and writes invalidate it"""
+    service = ProfileService(db_session, redis_client)
+    await redis_client.delete(service._cache_key(user.id))
+    
+    first = await service.get_profile(user.id)
+    with count_queries() as statements:
+        cached = await ProfileService(db_session, redis_client).get_profile(user.id)
+    
+    assert statements == []
+    assert cached == first
+    
+    updated = await service.update_profile(user.id, ProfileUpdate(name="Max"))
+    assert updated.name == "Max"
+    assert (await service.get_profile(user.id)).name == "Max"
+    
+    await redis_client.delete(service._cache_key(user.id))
@@ -1,17 +1,6 @@
 """Tests for Redis connection"""
 
 import pytest
-import redis.asyncio as redis
-
-from app.config import settings
-
-
-@pytest.fixture
-async def redis_client():
-    """Create a Redis client for testing"""
-    client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-    yield client
-    await client.close()
 
 
 @pytest.mark.asyncio
@@ -49,6 +38,9 @@ async def test_redis_expiration(redis_client):
     # Check TTL
     ttl = await redis_client.ttl("test_expire")
     assert ttl > 0 and ttl <= 1
+    
+    # Clean up
+    await redis_client.delete("test_expire")
 
 
 @pytest.mark.asyncio
@@ -69,9 +61,8 @@ async def test_redis_delete(redis_client):
 @pytest.mark.asyncio
 async def test_redis_hash_operations(redis_client):
     """Test Redis hash operations for caching"""
-    # Set hash fields
-    await redis_client.hset("test_hash", "field1", "value1")
-    await redis_client.hset("test_hash", "field2", "value2")
+    # Set hash fields (one HSET for both)
+    await redis_client.hset("test_hash", mapping={"field1": "value1", "field2": "value2"})
     
     # Get hash field
     value = await redis_client.hget("test_hash", "field1")
@@ -0,0 +1,116 @@
+"""Tests for the unread message count cache"""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+
+from db.cache import unread
+from db.cache.unread import UNREAD_COUNT_PREFIX, get_unread_count
+from db.models import Conversation, Match, Message, User
+
+
+async def wait_for_invalidations():
+    """Wait for the background invalidations scheduled by after_commit"""
+    while unread._pending_invalidations:
+        await asyncio.gather(*unread._pending_invalidations)
+
+
+@pytest.fixture
+async def conversation(db_session):
+    """A conversation between two matched users"""
+    sender = User(email="sender@example.com", password_hash="x")
+    recipient = User(email="recipient@example.com", password_hash="x")
+    db_session.add_all([sender, recipient])
+    await db_session.flush()
+    
+    user1_id, user2_id = Match.ordered_pair(sender.id, recipient.id)
+    match = Match(user1_id=user1_id, user2_id=user2_id)
+    db_session.add(match)
+    await db_session.flush()
+    
+    conversation = Conversation(
+        id=uuid.uuid4(), match_id=match.id, user1_id=user1_id, user2_id=user2_id
+    )
+    db_session.add(conversation)
+    await db_session.commit()
+    return conversation, sender.id, recipient.id
+
+
+@pytest.fixture
+async def unread_key(redis_client, conversation):
+    """The recipient's cache key, deleted again after the test"""
+    key = f"{UNREAD_COUNT_PREFIX}{conversation[2]}"
+    yield key
+    await wait_for_invalidations()
+    await redis_client.delete(key)
+
+
+def new_message(conversation):
+    """An unread message from the sender to the recipient"""
+    conversation, sender_id, recipient_id = conversation
+    return Message(
+        conversation_id=conversation.id,
+        sender_id=sender_id,
+        recipient_id=recipient_id,
+        content="Hi!",
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_unread_count_is_cached(db_session, redis_client, conversation, unread_key):
+    """Test that the count is stored in Redis and served from there"""
+    db_session.add(new_message(conversation))
+    await db_session.commit()
+    await wait_for_invalidations()
+    recipient_id = conversation[2]
+    
+    assert await get_unread_count(db_session, redis_client, recipient_id) == 1
+    assert await redis_client.get(unread_key) == "1"
+    
+    # A cached value is returned as-is, without recounting
+    await redis_client.set(unread_key, 7)
+    assert await get_unread_count(db_session, redis_client, recipient_id) == 7
+
+
+@pytest.mark.asyncio
+async def test_new_message_invalidates_count(db_session, redis_client, conversation, unread_key):
+    """Test that committing a new message deletes the recipient's cached count"""
+    assert await get_unread_count(db_session, redis_client, conversation[2]) == 0
+    
+    db_session.add(new_message(conversation))
+    await db_session.commit()
+    await wait_for_invalidations()
+    
+    assert await redis_client.get(unread_key) is None
+
+
+@pytest.mark.asyncio
+async def test_reading_message_invalidates_count(db_session, redis_client, conversation, unread_key):
+    """Test that committing read_at deletes the recipient's cached count"""
+    message = new_message(conversation)
+    db_session.add(message)
+    await db_session.commit()
+    await wait_for_invalidations()
+    assert await get_unread_count(db_session, redis_client, conversation[2]) == 1
+    
+    message.read_at = datetime.utcnow()
+    await db_session.commit()
+    await wait_for_invalidations()
+    
+    assert await redis_client.get(unread_key) is None
+    assert await get_unread_count(db_session, redis_client, conversation[2]) == 0
+
+
+@pytest.mark.asyncio
+async def test_rollback_keeps_count(db_session, redis_client, conversation, unread_key):
+    """Test that a rolled-back message leaves the cached count alone"""
+    assert await get_unread_count(db_session, redis_client, conversation[2]) == 0
+    
+    db_session.add(new_message(conversation))
+    await db_session.flush()
+    await db_session.rollback()
+    await wait_for_invalidations()
+    
+    assert await redis_client.get(unread_key) == "0"